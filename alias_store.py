@@ -0,0 +1,84 @@
+import logging
+import sqlite3
+import threading
+import time
+
+# Persistent Sportybet -> Betpawa team name aliases learned from successful
+# conversions. The SQLite file is only opened on the first lookup, then read
+# fully into memory; lookups are served from that in-process cache and new
+# aliases are written through to disk. An alias is verified when the
+# fixture it found had its kickoff checked too; aliases learned through the
+# name search alone are kept unverified, and callers decide how far to trust
+# them.
+
+
+class AliasStore:
+    def __init__(self, path):
+        self.path = path
+        self._aliases = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._aliases is not None:
+                return
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS aliases ("
+                "source TEXT PRIMARY KEY, target TEXT NOT NULL, "
+                "hits INTEGER NOT NULL DEFAULT 1, updated_at REAL NOT NULL, "
+                "verified INTEGER NOT NULL DEFAULT 1)")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(aliases)")}
+            if "verified" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE aliases ADD COLUMN verified INTEGER NOT NULL DEFAULT 1")
+                self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT source, target, verified FROM aliases").fetchall()
+            self._aliases = {source: (target, bool(verified))
+                             for source, target, verified in rows}
+            logging.info(f"Loaded {len(rows)} team aliases from {self.path}")
+
+    # Function to look up a learned alias as (target, verified), returning None when there isn't one
+
+    def get(self, source):
+        if self._aliases is None:
+            self._load()
+        return self._aliases.get(source)
+
+    # Function to remember a name resolution that led to a successful bet.
+    # An unverified resolution never replaces a verified alias to another name
+
+    def record(self, source, target, verified=True):
+        if source == target:
+            return
+        if self._aliases is None:
+            self._load()
+        with self._lock:
+            known = self._aliases.get(source)
+            if known is not None and known[0] == target:
+                verified = verified or known[1]
+            elif known is not None and known[1] and not verified:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT INTO aliases (source, target, hits, updated_at, verified) "
+                    "VALUES (?, ?, 1, ?, ?) "
+                    "ON CONFLICT(source) DO UPDATE SET target = excluded.target, "
+                    "hits = hits + 1, updated_at = excluded.updated_at, "
+                    "verified = excluded.verified",
+                    (source, target, time.time(), int(verified)))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Failed to save team alias {source} -> {target}: {e}")
+                return
+            if known != (target, verified):
+                logging.info(
+                    f"Learned {'verified' if verified else 'unverified'} team alias: {source} -> {target}")
+            self._aliases[source] = (target, verified)
+
+    def __len__(self):
+        if self._aliases is None:
+            self._load()
+        return len(self._aliases)
@@ -0,0 +1,91 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Batch conversion of many Sportybet codes at once. Slips are fetched
+# concurrently, every distinct (event, market, selection) is resolved only
+# once however many slips share it, and each slip is assembled into its own
+# booking as soon as its legs are ready. Results are yielded in completion
+# order.
+
+
+def leg_key(match):
+    return (match.event_id, match.market_type, match.line, match.selection)
+
+
+def _resolve_safely(resolve, match):
+    try:
+        return resolve(match)
+    except Exception as e:
+        logging.warning(
+            f"Failed to resolve {match.home_team} vs {match.away_team}: {e}")
+        return None
+
+
+def _assemble(assemble, booking_code, matches, leg_futures):
+    resolved = [future.result() for future in leg_futures]
+    return assemble(booking_code, matches, resolved)
+
+# Function to convert many booking codes, yielding one result dict per code and a final summary
+#   fetch_matches(code) -> Sportybet legs for the code
+#   resolve(match) -> resolved Betpawa leg, or None if it needs the browser
+#   assemble(code, matches, resolved) -> (Betpawa booking code, extra result fields) for the slip
+
+
+def run_batch(booking_codes, fetch_matches, resolve, assemble, workers=8):
+    fetch_pool = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="batch-fetch")
+    leg_pool = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="batch-leg")
+    slip_pool = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="batch-slip")
+    try:
+        fetches = {fetch_pool.submit(fetch_matches, code): code
+                   for code in booking_codes}
+        slips = {}
+        leg_futures = {}
+        total_legs = 0
+        pending = set(fetches)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in fetches:
+                    booking_code = fetches[future]
+                    try:
+                        matches = future.result()
+                    except Exception as e:
+                        yield {'booking_code': booking_code, 'error': str(e)}
+                        continue
+                    if not matches:
+                        yield {'booking_code': booking_code,
+                               'error': "No matches found for the given SportyBet booking code"}
+                        continue
+                    # Legs already seen on another slip reuse that resolution
+                    slip_legs = []
+                    for match in matches:
+                        key = leg_key(match)
+                        if key not in leg_futures:
+                            leg_futures[key] = leg_pool.submit(
+                                _resolve_safely, resolve, match)
+                        slip_legs.append(leg_futures[key])
+                    total_legs += len(matches)
+                    slip_future = slip_pool.submit(
+                        _assemble, assemble, booking_code, matches, slip_legs)
+                    slips[slip_future] = booking_code
+                    pending.add(slip_future)
+                else:
+                    booking_code = slips[future]
+                    try:
+                        converted_code, details = future.result()
+                        yield {'booking_code': booking_code, 'converted_code': converted_code, **details}
+                    except Exception as e:
+                        yield {'booking_code': booking_code, 'error': str(e)}
+
+        yield {'summary': {
+            'booking_codes': len(booking_codes),
+            'total_legs': total_legs,
+            'distinct_legs': len(leg_futures),
+        }}
+    finally:
+        # Stop outstanding work if the client goes away mid-stream
+        for pool in (fetch_pool, leg_pool, slip_pool):
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,122 @@
+import json
+import os
+import statistics
+import sys
+import time
+
+from selenium import webdriver
+
+from browser_profile import apply_lean_options, enable_request_blocking
+
+# Benchmark of the lean browser profile against the default one: page-load
+# time, bytes received over the network and Chrome RSS per page load of the Betpawa pages
+# a conversion visits. Run with: python benchmark_browser_profile.py [url ...]
+
+DEFAULT_URLS = ["https://www.betpawa.co.tz/"]
+LOADS_PER_URL = 5
+
+# Reads load time from the Navigation Timing API. Bytes come from the CDP
+# performance log instead: Resource Timing reports transferSize 0 for
+# cross-origin responses without Timing-Allow-Origin, which is exactly the
+# trackers and ads lean mode blocks
+PAGE_LOAD_MS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav ? nav.loadEventEnd - nav.startTime : null;
+"""
+
+
+def make_driver(lean):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--start-maximized")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if lean:
+        apply_lean_options(options)
+    driver = webdriver.Chrome(options=options)
+    if lean:
+        enable_request_blocking(driver)
+    return driver
+
+# Function to sum the RSS of chromedriver and every Chrome process below it (Linux /proc)
+
+
+def process_tree_rss(root_pid):
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after its closing paren
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except OSError:
+            continue
+    return total
+
+
+# Function to total the encoded bytes and count the requests that finished loading since the log was last read
+
+
+def network_totals(driver):
+    transferred, finished = 0, 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry['message'])['message']
+        if message.get('method') == "Network.loadingFinished":
+            transferred += message['params'].get('encodedDataLength', 0)
+            finished += 1
+    return transferred, finished
+
+
+def run_profile(lean, urls):
+    driver = make_driver(lean)
+    load_times, transferred, requests, rss = [], [], [], []
+    try:
+        for url in urls:
+            for _ in range(LOADS_PER_URL):
+                # Start each load from a blank page so nothing is reused from memory
+                driver.get("about:blank")
+                driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+                network_totals(driver)  # drop events from earlier loads
+                start = time.perf_counter()
+                driver.get(url)
+                wall_ms = (time.perf_counter() - start) * 1000
+                load_times.append(driver.execute_script(PAGE_LOAD_MS_JS) or wall_ms)
+                page_bytes, page_requests = network_totals(driver)
+                transferred.append(page_bytes)
+                requests.append(page_requests)
+                rss.append(process_tree_rss(driver.service.process.pid))
+    finally:
+        driver.quit()
+    return {
+        'load_ms': statistics.median(load_times),
+        'kb': statistics.median(transferred) / 1024,
+        'requests': statistics.median(requests),
+        'rss_mb': max(rss) / (1024 * 1024),
+    }
+
+
+if __name__ == "__main__":
+    urls = sys.argv[1:] or DEFAULT_URLS
+    results = {
+        'default': run_profile(False, urls),
+        'lean': run_profile(True, urls),
+    }
+    print(f"{'profile':>8} {'load (ms)':>10} {'transferred (KB)':>17} {'requests':>9} {'peak RSS (MB)':>14}")
+    for name, result in results.items():
+        print(f"{name:>8} {result['load_ms']:>10.0f} {result['kb']:>17.0f} "
+              f"{result['requests']:>9.0f} {result['rss_mb']:>14.0f}")
@@ -0,0 +1,195 @@
+import argparse
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests
+
+# End-to-end benchmark of the /convert flow, fully offline. A local server
+# plays both bookmakers: a fake Sportybet share API serving synthetic slips
+# (1X2, Over/Under and GG/NG legs) and a static replica of the Betpawa DOM
+# in benchmark_site/. flaskedgrokken2 is pointed at it through its
+# environment, runs headless Chrome as usual, and each slip size and
+# concurrency level reports p50/p95/p99 latency and conversions per minute.
+# Run with: python benchmark_conversion.py [--legs 1 5 10] [--concurrency 1 2 4]
+
+SITE_DIR = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), "benchmark_site")
+SHARE_API_PREFIX = "/api/tz/orders/share/"
+LEG_COUNTS = [1, 5, 10, 20, 30]
+CONCURRENCY_LEVELS = [1, 2, 4]
+# Conversions submitted per concurrent client at each level
+CONVERSIONS_PER_CLIENT = 3
+JOB_TIMEOUT = 600
+POLL_INTERVAL = 0.1
+
+# Function to build the Sportybet share payload for a code of the form BENCH-<legs>-<run>
+
+
+def make_slip(booking_code):
+    _, legs, run = booking_code.split("-")
+    start_time = int((time.time() + 24 * 3600) * 1000)
+    outcomes = []
+    for i in range(int(legs)):
+        outcome = {
+            'eventId': f"sr:match:{run}{i:03d}",
+            'homeTeamName': f"Home Side {run}-{i}",
+            'awayTeamName': f"Away Side {run}-{i}",
+            'estimateStartTime': start_time,
+        }
+        kind = i % 3
+        if kind == 0:
+            selection = ("Home", "Draw", "Away")[(i // 3) % 3]
+            outcome['markets'] = [{'desc': '1X2', 'outcomes': [
+                {'desc': selection, 'odds': "1.95", 'isSelected': True}]}]
+        elif kind == 1:
+            line = ("0.5", "1.5", "2.5", "3.5", "4.5")[i % 5]
+            side = "Over" if i % 2 else "Under"
+            outcome['markets'] = [{'desc': 'Over/Under', 'specifier': f"total={line}",
+                                   'outcomes': [{'desc': f"{side} {line}", 'odds': "1.80", 'isSelected': True}]}]
+        else:
+            outcome['markets'] = [{'desc': 'GG/NG', 'outcomes': [
+                {'desc': "Yes" if i % 2 else "No", 'odds': "1.70", 'isSelected': True}]}]
+        outcomes.append(outcome)
+    return {'bizCode': 10000, 'data': {'shareCode': booking_code, 'outcomes': outcomes}}
+
+
+class ReplicaHandler(BaseHTTPRequestHandler):
+    PAGES = {"/": ("index.html", "text/html"),
+             "/site.js": ("site.js", "application/javascript")}
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith(SHARE_API_PREFIX):
+            body = json.dumps(
+                make_slip(path[len(SHARE_API_PREFIX):])).encode()
+            return self._send(body, "application/json")
+        if path.startswith("/event/"):
+            page = ("event.html", "text/html")
+        else:
+            page = self.PAGES.get(path)
+        if page is None:
+            self.send_error(404)
+            return
+        with open(os.path.join(SITE_DIR, page[0]), "rb") as f:
+            self._send(f.read(), page[1])
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Function to import the app against the replica and serve it on a free local port
+
+
+def start_app(replica_url, pool_size):
+    os.environ.update({
+        "SPORTYBET_API_URL": replica_url + SHARE_API_PREFIX + "{booking_code}?_t={timestamp}",
+        "BETPAWA_BASE_URL": replica_url,
+        "BETPAWA_API_ENABLED": "0",
+        "BROWSER_HEADLESS": "1",
+        "DRIVER_POOL_SIZE": str(pool_size),
+        "ALIAS_DB_PATH": os.path.join(tempfile.mkdtemp(), "aliases.db"),
+    })
+    # Imported only now, since the app reads its configuration at import time
+    import flaskedgrokken2
+    from werkzeug.serving import make_server
+
+    server = start_server(make_server(
+        "127.0.0.1", 0, flaskedgrokken2.app, threaded=True))
+    flaskedgrokken2.driver_pool.warm()
+    return flaskedgrokken2, server, f"http://127.0.0.1:{server.server_port}"
+
+# Function to run one conversion through /convert and the job status endpoint, returning (seconds, ok)
+
+
+def convert(app_url, booking_code):
+    start = time.perf_counter()
+    response = requests.post(f"{app_url}/convert",
+                             json={"booking_code": booking_code}, timeout=10)
+    body = response.json()
+    if response.status_code != 202:
+        return time.perf_counter() - start, body.get('status') == "done"
+    status_url = app_url + body['status_url']
+    while time.perf_counter() - start < JOB_TIMEOUT:
+        job = requests.get(status_url, timeout=10).json()
+        if job['status'] in ("done", "failed"):
+            return time.perf_counter() - start, job['status'] == "done"
+        time.sleep(POLL_INTERVAL)
+    return time.perf_counter() - start, False
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    # Nearest-rank percentile
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def run_level(app_url, legs, concurrency, runs, first_run):
+    codes = [f"BENCH-{legs}-{first_run + i}" for i in range(runs)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        results = list(clients.map(lambda code: convert(app_url, code), codes))
+    wall = time.perf_counter() - start
+    latencies = [seconds for seconds, ok in results if ok]
+    return {
+        'ok': len(latencies),
+        'failed': len(results) - len(latencies),
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'per_minute': len(latencies) / wall * 60,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Offline end-to-end /convert benchmark")
+    parser.add_argument("--legs", type=int, nargs="+", default=LEG_COUNTS)
+    parser.add_argument("--concurrency", type=int,
+                        nargs="+", default=CONCURRENCY_LEVELS)
+    parser.add_argument("--runs-per-client", type=int,
+                        default=CONVERSIONS_PER_CLIENT)
+    args = parser.parse_args()
+
+    replica = start_server(ThreadingHTTPServer(("127.0.0.1", 0), ReplicaHandler))
+    replica_url = f"http://127.0.0.1:{replica.server_port}"
+    app_module, app_server, app_url = start_app(
+        replica_url, max(args.concurrency))
+
+    print(f"{'legs':>5} {'clients':>8} {'ok':>4} {'failed':>7} {'p50 (s)':>8} "
+          f"{'p95 (s)':>8} {'p99 (s)':>8} {'conv/min':>9}")
+    # Every run uses fresh codes and fixtures so no cache short-circuits a conversion
+    next_run = int(time.time()) % 100000 * 1000
+    try:
+        for legs in args.legs:
+            for concurrency in args.concurrency:
+                runs = concurrency * args.runs_per_client
+                result = run_level(app_url, legs, concurrency, runs, next_run)
+                next_run += runs
+                print(f"{legs:>5} {concurrency:>8} {result['ok']:>4} {result['failed']:>7} "
+                      f"{result['p50']:>8.2f} {result['p95']:>8.2f} {result['p99']:>8.2f} "
+                      f"{result['per_minute']:>9.1f}")
+    finally:
+        app_server.shutdown()
+        replica.shutdown()
+        app_module.driver_pool.close()
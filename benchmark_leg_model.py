@@ -0,0 +1,73 @@
+import gc
+import tracemalloc
+
+from legs import MARKET_1X2, MARKET_BTTS, MARKET_OVER_UNDER, Leg
+
+# Memory per leg of the slotted Leg model against the dict legs
+# get_sportybet_matches used to build. Legs are generated the way a full
+# catalog or job history repeats them: few distinct teams, markets and
+# selections across many legs. Run with: python benchmark_leg_model.py
+
+LEG_COUNT = 100000
+TEAMS = 400
+
+MARKETS = [
+    (MARKET_1X2, None, ["Home", "Draw", "Away"]),
+    (MARKET_OVER_UNDER, "2.5", ["Over 2.5", "Under 2.5"]),
+    (MARKET_OVER_UNDER, "1.5", ["Over 1.5", "Under 1.5"]),
+    (MARKET_BTTS, None, ["Yes", "No"]),
+]
+
+
+# Function to yield the raw fields of each leg, with strings freshly built as a JSON decoder would
+
+
+def raw_legs(count):
+    for i in range(count):
+        market_type, line, names = MARKETS[i % len(MARKETS)]
+        yield {
+            'event_id': f"sr:match:{i // 3}",
+            'home_team': f"Home Team {i % TEAMS}",
+            'away_team': f"Away Team {(i * 7) % TEAMS}",
+            'start_time': 1741800000000 + i * 60000,
+            'market_type': ''.join(market_type),
+            'line': ''.join(line) if line else None,
+            'selection': ''.join(names[i % len(names)]),
+            'odds': [(''.join(name), 1.5 + k / 10) for k, name in enumerate(names)],
+        }
+
+
+def as_dict(raw):
+    return {
+        'event_id': raw['event_id'],
+        'home_team': raw['home_team'],
+        'away_team': raw['away_team'],
+        'start_time': raw['start_time'],
+        'market': f"{raw['market_type']} {raw['line']}" if raw['line'] else raw['market_type'],
+        'selection': raw['selection'],
+        'odds': dict(raw['odds']),
+    }
+
+
+def as_leg(raw):
+    return Leg(raw['event_id'], raw['home_team'], raw['away_team'], raw['start_time'],
+               raw['market_type'], raw['selection'], line=raw['line'], odds=raw['odds'])
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    legs = [build(raw) for raw in raw_legs(LEG_COUNT)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del legs
+    return size / LEG_COUNT
+
+
+if __name__ == "__main__":
+    dict_bytes = measure(as_dict)
+    leg_bytes = measure(as_leg)
+    print(f"{'model':>6} {'bytes/leg':>10}")
+    print(f"{'dict':>6} {dict_bytes:>10.0f}")
+    print(f"{'Leg':>6} {leg_bytes:>10.0f}")
+    print(f"saving: {(1 - leg_bytes / dict_bytes) * 100:.0f}%")
@@ -0,0 +1,65 @@
+import random
+import time
+
+from match_join import join_matches
+
+# Benchmark of join_matches against the old nested-loop matcher on
+# synthetic feeds of growing size. Run with: python benchmark_match_join.py
+
+FEED_SIZES = [100, 1000, 5000, 20000, 100000]
+# The nested loop is quadratic, so it is only timed on the smaller feeds
+NESTED_LOOP_MAX_SIZE = 5000
+
+
+# Function to build a pair of feeds where most events appear on both sides
+
+
+def make_feeds(size, seed=42):
+    rng = random.Random(seed)
+    base_time = 1741800000000
+    sportybet_matches = []
+    betpawa_matches = []
+    for i in range(size):
+        home, away = f"Home Team {i}", f"Away Team {i}"
+        start_time = base_time + rng.randrange(0, 7 * 24 * 60) * 60000
+        sportybet_matches.append(
+            {'home_team': home, 'away_team': away, 'start_time': start_time})
+        # About 10% of events are missing on Betpawa
+        if rng.random() < 0.9:
+            betpawa_matches.append({'home_team': home.upper(), 'away_team': away.upper(),
+                                    'start_time': start_time + rng.randrange(-30000, 30000)})
+    rng.shuffle(betpawa_matches)
+    return sportybet_matches, betpawa_matches
+
+
+def nested_loop(sportybet_matches, betpawa_matches):
+    equivalent_matches = []
+    for sb_match in sportybet_matches:
+        for bp_match in betpawa_matches:
+            if (sb_match['home_team'].lower() == bp_match['home_team'].lower() and
+                sb_match['away_team'].lower() == bp_match['away_team'].lower() and
+                    abs(sb_match['start_time'] - bp_match['start_time']) < 60000):
+                equivalent_matches.append((sb_match, bp_match))
+    return equivalent_matches
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{'events':>8} {'matched':>8} {'hash join':>12} {'nested loop':>12}")
+    for size in FEED_SIZES:
+        sportybet_matches, betpawa_matches = make_feeds(size)
+        (pairs, _, _), join_time = timed(
+            join_matches, sportybet_matches, betpawa_matches)
+        nested_column = "skipped"
+        if size <= NESTED_LOOP_MAX_SIZE:
+            expected, nested_time = timed(
+                nested_loop, sportybet_matches, betpawa_matches)
+            assert len(expected) == len(pairs)
+            nested_column = f"{nested_time * 1000:.1f} ms"
+        print(
+            f"{size:>8} {len(pairs):>8} {join_time * 1000:>9.1f} ms {nested_column:>12}")
@@ -0,0 +1,65 @@
+import random
+import time
+
+import odds_compare
+from odds_compare import align_prices, compare_odds, ranked_report
+
+# Benchmark of the cross-book odds comparison on a full-day catalog: the
+# per-event nested dict loop map_bets used to feed, the engine's plain
+# Python path, and (when installed) its NumPy path. Run with:
+# python benchmark_odds_compare.py
+
+EVENT_COUNTS = [1000, 5000, 20000, 50000]
+REPEATS = 5
+
+
+def make_catalog(events, seed=7):
+    rng = random.Random(seed)
+    sportybet, betpawa = {}, {}
+    for i in range(events):
+        key = f"sr:match:{i}"
+        prices = tuple(rng.uniform(1.2, 9) for _ in range(3))
+        sportybet[key] = tuple(round(p * rng.uniform(0.97, 1.03), 2) for p in prices)
+        betpawa[key] = tuple(round(p * rng.uniform(0.97, 1.03), 2) for p in prices)
+    return sportybet, betpawa
+
+
+def legacy_compare(sportybet, betpawa):
+    mapped = {}
+    for key, (home_win, draw, away_win) in sportybet.items():
+        mapped[key] = {"sportybet": {"home_win": home_win, "draw": draw, "away_win": away_win}}
+    for key, (home_win, draw, away_win) in betpawa.items():
+        if key in mapped:
+            mapped[key]["betpawa"] = {"home_win": home_win, "draw": draw, "away_win": away_win}
+    rows = []
+    for key, books in mapped.items():
+        best = {name: max(books["sportybet"][name], books["betpawa"][name])
+                for name in ("home_win", "draw", "away_win")}
+        rows.append((sum(1 / price for price in best.values()) - 1, key, books, best))
+    rows.sort(key=lambda row: row[0])
+    return rows[:50]
+
+
+def engine(vectorized):
+    def run(sportybet, betpawa):
+        return ranked_report(compare_odds(*align_prices(sportybet, betpawa),
+                                          vectorized=vectorized))
+    return run
+
+
+def timed(function, sportybet, betpawa):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        function(sportybet, betpawa)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+if __name__ == "__main__":
+    variants = [("dict loop", legacy_compare), ("engine/python", engine(False))]
+    if odds_compare.np is not None:
+        variants.append(("engine/numpy", engine(True)))
+    print(f"{'events':>7} " + " ".join(f"{name + ' (ms)':>18}" for name, _ in variants))
+    for events in EVENT_COUNTS:
+        sportybet, betpawa = make_catalog(events)
+        columns = [f"{timed(function, sportybet, betpawa):>18.2f}" for _, function in variants]
+        print(f"{events:>7} " + " ".join(columns))
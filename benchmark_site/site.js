@@ -0,0 +1,170 @@
+// Static replica of the parts of the Betpawa site the converter drives:
+// header search, search results, event page markets, betslip and the
+// booking code popup. Served by benchmark_conversion.py; the class names
+// and attributes mirror the selectors in betpawa_selectors.py.
+
+const BETSLIP_KEY = 'betslip';
+const OVER_UNDER_LINES = ['0.5', '1.5', '2.5', '3.5', '4.5'];
+
+function hash(text) {
+    let h = 2166136261;
+    for (let i = 0; i < text.length; i++) {
+        h ^= text.charCodeAt(i);
+        h = Math.imul(h, 16777619);
+    }
+    return h >>> 0;
+}
+
+function price(...parts) {
+    return (1.1 + (hash(parts.join('|')) % 490) / 100).toFixed(2);
+}
+
+function loadSlip() {
+    return JSON.parse(localStorage.getItem(BETSLIP_KEY) || '[]');
+}
+
+function saveSlip(slip) {
+    localStorage.setItem(BETSLIP_KEY, JSON.stringify(slip));
+    renderBetslip();
+}
+
+function renderBetslip() {
+    const slip = loadSlip();
+    const main = document.querySelector('div.betslip-main');
+    main.classList.toggle('empty-betslip', slip.length === 0);
+    main.querySelector('.betslip-count').textContent = `${slip.length} selections`;
+}
+
+function showBookingCode() {
+    const slip = loadSlip();
+    const code = hash(JSON.stringify(slip)).toString(36).toUpperCase().padStart(7, 'B');
+    const popup = document.getElementById('booking-popup');
+    popup.innerHTML = '';
+    // Rendered after a short delay, like the real booking API call
+    setTimeout(() => {
+        const heading = document.createElement('h2');
+        heading.textContent = code;
+        popup.appendChild(heading);
+    }, 50);
+}
+
+function openSearch() {
+    if (document.querySelector('#search-box input')) {
+        return;
+    }
+    const input = document.createElement('input');
+    input.type = 'text';
+    input.placeholder = 'Search';
+    input.addEventListener('keydown', event => {
+        if (event.key === 'Enter') {
+            search(input.value);
+        }
+    });
+    document.getElementById('search-box').appendChild(input);
+}
+
+function search(query) {
+    const [home, away] = query.split(' vs ').map(part => part.trim());
+    const results = document.getElementById('search-results');
+    results.innerHTML = '';
+    setTimeout(() => {
+        const container = document.createElement('div');
+        container.className = 'events-container prematch';
+        const teams = document.createElement('div');
+        teams.className = 'teams';
+        for (const name of [home, away]) {
+            const p = document.createElement('p');
+            p.textContent = name;
+            teams.appendChild(p);
+        }
+        teams.addEventListener('click', () => {
+            const params = new URLSearchParams({home: home, away: away});
+            window.location.href = `/event/${hash(home + '|' + away)}?${params}`;
+        });
+        container.appendChild(teams);
+        results.appendChild(container);
+    }, 100);
+}
+
+function priceButton(home, away, market, selection, label) {
+    const button = document.createElement('span');
+    button.className = 'event-bet-wrapper bet-price';
+    const selectionEl = document.createElement('span');
+    selectionEl.className = 'event-selection';
+    selectionEl.textContent = label;
+    const odds = document.createElement('span');
+    odds.className = 'event-odds';
+    odds.textContent = price(home, away, market, selection);
+    button.append(selectionEl, odds);
+    button.addEventListener('click', () => {
+        const slip = loadSlip();
+        slip.push({home: home, away: away, market: market, selection: selection, odds: odds.textContent});
+        saveSlip(slip);
+    });
+    return button;
+}
+
+function renderMarket(title, buttons) {
+    const container = document.createElement('div');
+    container.className = 'events-container';
+    const heading = document.createElement('h4');
+    heading.textContent = title;
+    container.appendChild(heading);
+    container.append(...buttons);
+    return container;
+}
+
+function renderEvent() {
+    const params = new URLSearchParams(window.location.search);
+    const home = params.get('home');
+    const away = params.get('away');
+    document.getElementById('event-title').textContent = `${home} - ${away}`;
+    const markets = document.getElementById('markets');
+    // Markets arrive after the page shell, like the real event API
+    setTimeout(() => {
+        markets.appendChild(renderMarket('1X2 | Full Time', [
+            priceButton(home, away, '1X2', 'Home', '1'),
+            priceButton(home, away, '1X2', 'Draw', 'X'),
+            priceButton(home, away, '1X2', 'Away', '2'),
+        ]));
+        const overUnder = [];
+        for (const line of OVER_UNDER_LINES) {
+            overUnder.push(priceButton(home, away, 'Over/Under', `Over ${line}`, `Over (${line})`));
+            overUnder.push(priceButton(home, away, 'Over/Under', `Under ${line}`, `Under (${line})`));
+        }
+        markets.appendChild(renderMarket('Over/Under | Full Time', overUnder));
+        markets.appendChild(renderMarket('Both Teams To Score | Full Time', [
+            priceButton(home, away, 'BTTS', 'Yes', 'Yes'),
+            priceButton(home, away, 'BTTS', 'No', 'No'),
+        ]));
+        markets.appendChild(renderMarket('Double Chance | Full Time', [
+            priceButton(home, away, 'Double Chance', 'Home or Draw', '1X'),
+            priceButton(home, away, 'Double Chance', 'Home or Away', '12'),
+            priceButton(home, away, 'Double Chance', 'Draw or Away', 'X2'),
+        ]));
+        markets.appendChild(renderMarket('Draw No Bet | Full Time', [
+            priceButton(home, away, 'Draw No Bet', 'Home', '1'),
+            priceButton(home, away, 'Draw No Bet', 'Away', '2'),
+        ]));
+        markets.appendChild(renderMarket('1X2 | 1st Half', [
+            priceButton(home, away, '1st Half 1X2', 'Home', '1'),
+            priceButton(home, away, '1st Half 1X2', 'Draw', 'X'),
+            priceButton(home, away, '1st Half 1X2', 'Away', '2'),
+        ]));
+        const firstHalfTotals = [];
+        for (const line of OVER_UNDER_LINES) {
+            firstHalfTotals.push(priceButton(home, away, '1st Half Over/Under', `Over ${line}`, `Over (${line})`));
+            firstHalfTotals.push(priceButton(home, away, '1st Half Over/Under', `Under ${line}`, `Under (${line})`));
+        }
+        markets.appendChild(renderMarket('Over/Under | 1st Half', firstHalfTotals));
+    }, 150);
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelector("svg[data-test-id='headerIconSearch']").addEventListener('click', openSearch);
+    document.querySelector('a.booking-code-link').addEventListener('click', showBookingCode);
+    renderBetslip();
+    if (document.getElementById('markets')) {
+        renderEvent();
+    }
+});
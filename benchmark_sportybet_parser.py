@@ -0,0 +1,113 @@
+import json
+import random
+import time
+
+import sportybet_parser
+from sportybet_parser import parse_share_payload
+
+# Benchmark of the Sportybet share payload parser against the old inline
+# loop from get_sportybet_matches, on synthetic slips of growing size where
+# every event carries many markets. Run with:
+# python benchmark_sportybet_parser.py
+
+LEG_COUNTS = [50, 100, 250, 500]
+# Markets per event; real share payloads list the picked market plus many siblings
+MARKETS_PER_EVENT = 40
+REPEATS = 50
+
+
+# Function to build a share payload whose events each carry many markets with one picked outcome
+
+
+def make_payload(legs, seed=7):
+    rng = random.Random(seed)
+    events = []
+    for i in range(legs):
+        markets = []
+        picked = rng.randrange(3)
+        for m in range(MARKETS_PER_EVENT):
+            desc = ('1X2', 'Over/Under', 'GG/NG')[m % 3] if m < 3 else f"Market {m}"
+            names = {'1X2': ["Home", "Draw", "Away"], 'Over/Under': ["Over 2.5", "Under 2.5"],
+                     'GG/NG': ["Yes", "No"]}.get(desc, ["A", "B", "C"])
+            selected = rng.randrange(len(names))
+            markets.append({
+                'id': str(m), 'desc': desc, 'specifier': "total=2.5" if desc == 'Over/Under' else "",
+                'status': 0, 'outcomes': [{
+                    'id': str(k), 'desc': name, 'odds': f"{rng.uniform(1.1, 9):.2f}",
+                    'isActive': 1, 'isSelected': m == picked and k == selected,
+                } for k, name in enumerate(names)],
+            })
+        events.append({
+            'eventId': f"sr:match:{i}", 'homeTeamName': f"Home Team {i} ",
+            'awayTeamName': f"Away Team {i}", 'estimateStartTime': 1741800000000 + i * 60000,
+            'sport': {'id': "sr:sport:1", 'name': "Football"}, 'markets': markets,
+        })
+    return json.dumps({'bizCode': 10000, 'data': {'outcomes': events}}).encode()
+
+
+def legacy_parse(body):
+    data = json.loads(body.decode())
+    matches = []
+    for outcome in data.get('data', {}).get('outcomes', []):
+        match = {
+            'event_id': outcome.get('eventId'),
+            'home_team': outcome.get('homeTeamName', '').strip(),
+            'away_team': outcome.get('awayTeamName', '').strip(),
+            'start_time': outcome.get('estimateStartTime'),
+            'market': None,
+            'selection': None,
+            'odds': {}
+        }
+        for market in outcome.get('markets', []):
+            market_desc = market.get('desc')
+            if market_desc == '1X2':
+                for outcome_data in market.get('outcomes', []):
+                    match['market'] = '1X2'
+                    match['selection'] = outcome_data.get('desc')
+                    match['odds'][outcome_data.get('desc')] = float(
+                        outcome_data.get('odds', 0))
+            elif market_desc == 'Over/Under':
+                specifier = market.get('specifier', '')
+                threshold = specifier.split(
+                    '=')[1] if '=' in specifier else '2.5'
+                for outcome_data in market.get('outcomes', []):
+                    match['market'] = f'Over/Under {threshold}'
+                    match['selection'] = outcome_data.get('desc')
+                    match['odds'][outcome_data.get('desc')] = float(
+                        outcome_data.get('odds', 0))
+            elif market_desc == 'GG/NG':
+                for outcome_data in market.get('outcomes', []):
+                    match['market'] = 'BTTS'
+                    match['selection'] = outcome_data.get('desc')
+                    match['odds'][outcome_data.get('desc')] = float(
+                        outcome_data.get('odds', 0))
+        if match['market'] and match['selection']:
+            matches.append(match)
+    return matches
+
+
+def with_stdlib_json(body):
+    backend = sportybet_parser.orjson
+    sportybet_parser.orjson = None
+    try:
+        return parse_share_payload(body)
+    finally:
+        sportybet_parser.orjson = backend
+
+
+def timed(function, body):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        function(body)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+if __name__ == "__main__":
+    parsers = [("legacy", legacy_parse), ("parser/json", with_stdlib_json)]
+    if sportybet_parser.orjson is not None:
+        parsers.append(("parser/orjson", parse_share_payload))
+    print(f"{'legs':>5} {'KB':>7} " + " ".join(f"{name + ' (ms)':>18}" for name, _ in parsers))
+    for legs in LEG_COUNTS:
+        body = make_payload(legs)
+        columns = [f"{timed(function, body):>18.2f}" for _, function in parsers]
+        print(f"{legs:>5} {len(body) / 1024:>7.0f} " + " ".join(columns))
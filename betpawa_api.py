@@ -0,0 +1,195 @@
+import logging
+import os
+from datetime import datetime, timezone
+
+import requests
+
+from http_client import get_http_client
+from market_table import RULES_BY_MARKET_TYPE
+
+# Browserless Betpawa conversion over the sportsbook JSON API, the same API
+# scripttwo.py reads booking numbers from. Legs are resolved to Betpawa price
+# ids with plain HTTP calls and the booking code is created from those ids.
+#
+# Only the booking-number GET is confirmed. The other endpoints are read in
+# exactly one shape, modelled on it, and any other shape raises
+# BetpawaApiError instead of being guessed at:
+#   search, upcoming: {"items": [{"event": EVENT}, ...]}
+#   event:            EVENT = {"id", "name": "Home - Away", "startTime",
+#                              "markets": [{"marketType": {"name"},
+#                                           "price": [{"id", "name", "price", "handicap"}]}]}
+#   booking (POST):   {"bookingNumber": "..."}
+# The module stays out of the request path (BETPAWA_API_ENABLED off) until
+# these are checked against recorded responses.
+
+# Site root, overridable so benchmarks can point at a local replica
+BETPAWA_BASE_URL = os.environ.get(
+    "BETPAWA_BASE_URL", "https://www.betpawa.co.tz").rstrip("/")
+BETPAWA_API_URL = BETPAWA_BASE_URL + "/api/sportsbook/v2"
+BETPAWA_SEARCH_URL = BETPAWA_API_URL + "/events/search"
+BETPAWA_EVENT_URL = BETPAWA_API_URL + "/events/{event_id}"
+BETPAWA_UPCOMING_URL = BETPAWA_API_URL + "/events/upcoming"
+BETPAWA_BOOKING_URL = BETPAWA_API_URL + "/booking-number"
+
+BETPAWA_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json",
+    "x-pawa-brand": "betpawa-tanzania",
+    "x-pawa-language": "en",
+}
+
+# Allowed difference between Sportybet and Betpawa kickoff times
+START_TIME_TOLERANCE_MS = 60000
+
+
+class BetpawaApiError(Exception):
+    pass
+
+
+# Function to parse a Betpawa ISO start time into a Unix timestamp in milliseconds
+
+
+def parse_start_time(start_time):
+    parsed = datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%SZ")
+    return int(parsed.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def normalize_name(name):
+    return " ".join(name.lower().replace("-", " ").split())
+
+
+class BetpawaApiClient:
+    def __init__(self, http=None, timeout=10):
+        self.http = http or get_http_client()
+        self.timeout = timeout
+
+    def _get(self, url, params=None):
+        try:
+            return self.http.get_json(url, params=params, headers=BETPAWA_HEADERS,
+                                      timeout=self.timeout)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            raise BetpawaApiError(f"GET {url} failed: {e}")
+
+    # Function to unwrap the events of a listing response
+
+    def _events(self, url, params=None):
+        data = self._get(url, params)
+        try:
+            return [item['event'] for item in data['items']]
+        except (KeyError, TypeError) as e:
+            raise BetpawaApiError(f"Unexpected response shape from {url}: {e!r}")
+
+    # Function to search upcoming events by free text
+
+    def search_events(self, query):
+        return self._events(BETPAWA_SEARCH_URL, params={"query": query})
+
+    # Function to page through the upcoming prematch events
+
+    def list_upcoming_events(self, page_size=200):
+        events = []
+        skip = 0
+        while True:
+            page = self._events(BETPAWA_UPCOMING_URL, params={
+                                "take": page_size, "skip": skip})
+            events.extend(page)
+            if len(page) < page_size:
+                return events
+            skip += page_size
+
+    # Function to fetch one event with all of its markets and prices
+
+    def get_event(self, event_id):
+        return self._get(BETPAWA_EVENT_URL.format(event_id=event_id))
+
+    # Function to create a booking code from a list of Betpawa price ids
+
+    def create_booking(self, price_ids):
+        payload = {"items": [{"priceId": price_id} for price_id in price_ids]}
+        try:
+            data = self.http.post_json(BETPAWA_BOOKING_URL, json=payload,
+                                       headers=BETPAWA_HEADERS, timeout=self.timeout)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            raise BetpawaApiError(f"Failed to create booking: {e}")
+        code = data.get('bookingNumber') if isinstance(data, dict) else None
+        if not code:
+            raise BetpawaApiError(f"No booking number in response: {data}")
+        return code
+
+
+# Function to find the Betpawa event for a Sportybet leg
+
+
+def find_event(client, home_team, away_team, start_time):
+    home, away = normalize_name(home_team), normalize_name(away_team)
+    for event in client.search_events(f"{home_team} {away_team}"):
+        names = event.get('name', '').split(' - ')
+        if len(names) != 2:
+            continue
+        if normalize_name(names[0]) != home or normalize_name(names[1]) != away:
+            continue
+        if start_time and event.get('startTime'):
+            if abs(parse_start_time(event['startTime']) - start_time) >= START_TIME_TOLERANCE_MS:
+                continue
+        return event
+    return None
+
+# Function to pick the Betpawa price for a leg's market and selection
+
+
+def find_price(event, leg):
+    rule = RULES_BY_MARKET_TYPE.get(leg.market_type)
+    outcome = rule.outcome(leg) if rule is not None else None
+    if outcome is None:
+        return None
+    threshold = float(leg.line) if leg.line is not None else None
+    market_type_name = rule.api_market_name
+    price_name = outcome.price_name
+
+    try:
+        for event_market in event['markets']:
+            if event_market['marketType']['name'] != market_type_name:
+                continue
+            for price in event_market['price']:
+                if price['name'] != price_name:
+                    continue
+                if threshold is not None and float(price['handicap']) != threshold:
+                    continue
+                return price
+    except (KeyError, TypeError, ValueError) as e:
+        raise BetpawaApiError(f"Unexpected event shape for {event.get('id')}: {e!r}")
+    return None
+
+# Function to resolve one leg to a Betpawa price, returning None when the API can't handle it
+
+
+def resolve_leg(client, match, home_team, away_team, catalog=None):
+    event = None
+    if catalog is not None and match.start_time:
+        entry = catalog.lookup(home_team, away_team, match.start_time)
+        if entry is not None:
+            event = entry.event
+    try:
+        if event is None:
+            event = find_event(client, home_team, away_team,
+                               match.start_time)
+        if event is None:
+            return None
+        # Listings carry no markets and catalog prices can be minutes old, so
+        # the price reported and booked is always read fresh from the event
+        event = client.get_event(event['id'])
+        price = find_price(event, match)
+    except BetpawaApiError as e:
+        logging.warning(
+            f"Betpawa API lookup failed for {home_team} vs {away_team}: {e}")
+        return None
+    if price is None:
+        return None
+    names = event.get('name', '').split(' - ')
+    return {
+        'event_id': event['id'],
+        'price_id': price['id'],
+        'price': price.get('price'),
+        'home_team': names[0] if len(names) == 2 else home_team,
+        'away_team': names[1] if len(names) == 2 else away_team,
+    }
@@ -0,0 +1,186 @@
+import threading
+import time
+from functools import lru_cache
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from readiness import EventWait, any_of_located
+
+# Registry of every Betpawa locator the scripts use. Each selector is
+# defined once as ordered fallback locators, scoped CSS first where the
+# markup allows it and the original XPath after it. Parameters (team names,
+# market titles) are escaped before they are spliced in, and each lookup
+# records which locator matched and how long it took, so slow or drifting
+# selectors show up in get_selector_stats().
+
+# Function to quote a value as an XPath string literal, using concat() when it holds both quote kinds
+
+
+def xpath_literal(value):
+    value = str(value)
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+# Function to quote a value as a CSS string
+
+
+def css_string(value):
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+@lru_cache(maxsize=4096)
+def _render(by, template, params):
+    quote = xpath_literal if by == By.XPATH else css_string
+    return template.format(**{name: quote(value) for name, value in params})
+
+
+class Selector:
+    def __init__(self, name, *locators):
+        self.name = name
+        self.templates = locators
+        # Parameterless locators are built once here, the rest per distinct parameters
+        self._static = list(locators) \
+            if all("{" not in template for _, template in locators) else None
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.misses = 0
+        self.hits = [0] * len(locators)
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def locators(self, **params):
+        if self._static is not None:
+            return self._static
+        items = tuple(sorted(params.items()))
+        return [(by, _render(by, template, items)) for by, template in self.templates]
+
+    # Function to return the primary locator, for callers still using WebDriverWait
+
+    def locator(self, **params):
+        return self.locators(**params)[0]
+
+    def _record(self, matched_index, seconds):
+        with self._lock:
+            self.lookups += 1
+            if matched_index is None:
+                self.misses += 1
+            else:
+                self.hits[matched_index] += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    # Function to wait for the first locator that matches, recording the step under step or the selector's name
+
+    def wait(self, driver, timeout, clickable=False, step=None, **params):
+        condition = any_of_located(self.locators(**params), clickable=clickable)
+        start = time.perf_counter()
+        try:
+            element = EventWait(driver, timeout, step=step or self.name).until(condition)
+        except TimeoutException:
+            self._record(None, time.perf_counter() - start)
+            raise
+        self._record(condition.matched_index, time.perf_counter() - start)
+        return element
+
+    # Function to find all elements under scope (a driver or element) with the first locator that matches
+
+    def find_all(self, scope, **params):
+        start = time.perf_counter()
+        for index, (by, value) in enumerate(self.locators(**params)):
+            elements = scope.find_elements(by, value)
+            if elements:
+                self._record(index, time.perf_counter() - start)
+                return elements
+        self._record(None, time.perf_counter() - start)
+        return []
+
+    def stats(self):
+        with self._lock:
+            return {
+                'lookups': self.lookups,
+                'misses': self.misses,
+                'hits_by_locator': list(self.hits),
+                'fallback_hits': sum(self.hits[1:]),
+                'mean_ms': self.total_seconds / self.lookups * 1000 if self.lookups else 0.0,
+                'max_ms': self.max_seconds * 1000,
+            }
+
+
+SEARCH_ICON = Selector(
+    "search_icon",
+    (By.CSS_SELECTOR, "svg[data-test-id='headerIconSearch']"),
+)
+
+SEARCH_INPUT = Selector(
+    "search_input",
+    (By.CSS_SELECTOR, "input[type='text']"),
+    (By.CSS_SELECTOR, "input[type='search']"),
+)
+
+# Clickable teams row of a search result
+EVENT_TEAMS = Selector(
+    "event_teams",
+    (By.XPATH, "//div[contains(@class, 'events-container prematch')]//div[contains(@class, 'teams') and .//p[contains(text(), {home_team})] and .//p[contains(text(), {away_team})]]"),
+    (By.XPATH, "//div[contains(@class, 'events-container')]//div[contains(@class, 'teams') and .//p[contains(text(), {home_team})] and .//p[contains(text(), {away_team})]]"),
+)
+
+# Search result container holding a fixture's teams row and its prices
+EVENT_CONTAINER = Selector(
+    "event_container",
+    (By.XPATH, "//div[contains(@class, 'events-container prematch')][.//div[contains(@class, 'teams') and .//p[contains(text(), {home_team})] and .//p[contains(text(), {away_team})]]]"),
+    (By.XPATH, "//div[contains(@class, 'events-container')][.//div[contains(@class, 'teams') and .//p[contains(text(), {home_team})] and .//p[contains(text(), {away_team})]]]"),
+)
+
+# Market block on the event page, found by its h4 title
+MARKET_CONTAINER = Selector(
+    "market_container",
+    (By.XPATH, "//div[contains(@class, 'events-container')][.//h4[contains(text(), {market_title})]]"),
+    (By.XPATH, "//div[contains(@class, 'events-container')]//h4[contains(text(), {market_title})]//ancestor::div[contains(@class, 'events-container')]"),
+)
+
+# Price buttons, looked up relative to a market or event container
+BET_PRICE_BUTTONS = Selector(
+    "bet_price_buttons",
+    (By.CSS_SELECTOR, "span.event-bet-wrapper.bet-price"),
+    (By.XPATH, ".//span[contains(@class, 'event-bet-wrapper') and contains(@class, 'bet-price')]"),
+)
+
+# Price button whose selection label equals label, relative to a container
+BET_PRICE_BUTTON_BY_LABEL = Selector(
+    "bet_price_button_by_label",
+    (By.XPATH, ".//span[contains(@class, 'event-bet-wrapper') and contains(@class, 'bet-price') and .//span[contains(@class, 'event-selection') and text()={label}]]"),
+)
+
+BETSLIP_FILLED = Selector(
+    "betslip_filled",
+    (By.CSS_SELECTOR, "div.betslip-main:not(.empty-betslip)"),
+)
+
+BOOKING_CODE_LINK = Selector(
+    "booking_code_link",
+    (By.CSS_SELECTOR, "a.underline.booking-code-link"),
+    (By.XPATH, "//a[contains(@class, 'underline') and contains(@class, 'booking-code-link') and .//span[contains(text(), 'Booking code')]]"),
+)
+
+BOOKING_CODE_POPUP = Selector(
+    "booking_code_popup",
+    (By.CSS_SELECTOR, "h2"),
+)
+
+SELECTORS = {selector.name: selector for selector in (
+    SEARCH_ICON, SEARCH_INPUT, EVENT_TEAMS, EVENT_CONTAINER, MARKET_CONTAINER,
+    BET_PRICE_BUTTONS, BET_PRICE_BUTTON_BY_LABEL, BETSLIP_FILLED,
+    BOOKING_CODE_LINK, BOOKING_CODE_POPUP,
+)}
+
+# Function to return lookup counts, per-locator hits and latency for every selector
+
+
+def get_selector_stats():
+    return {name: selector.stats() for name, selector in SELECTORS.items()}
@@ -0,0 +1,56 @@
+import logging
+
+# Lean Chrome profile for conversions. Conversion only needs Betpawa's DOM
+# and API calls, so images, fonts, media, analytics and ad scripts are
+# blocked through DevTools request interception and background Chrome
+# features are switched off.
+
+# URL patterns blocked with Network.setBlockedURLs
+LEAN_BLOCKED_URL_PATTERNS = [
+    # Images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.svg",
+    "*.mp4", "*.webm", "*.mp3",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Analytics, tag managers and ads
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*facebook.com/tr*",
+    "*hotjar.com*", "*clarity.ms*", "*onesignal.com*", "*adservice.google.*",
+]
+
+LEAN_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+LEAN_CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+}
+
+# Function to add the lean switches and preferences to ChromeOptions
+
+
+def apply_lean_options(options):
+    for argument in LEAN_CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", LEAN_CHROME_PREFS)
+    return options
+
+# Function to block unneeded requests on a running driver through DevTools
+
+
+def enable_request_blocking(driver, extra_patterns=()):
+    patterns = LEAN_BLOCKED_URL_PATTERNS + list(extra_patterns)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    logging.info(f"Blocking {len(patterns)} URL patterns in lean browser mode")
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Cache of Sportybet booking code -> generated Betpawa booking code.
+# An entry lives until the earliest leg on the slip kicks off or the TTL
+# runs out, whichever comes first, and the least recently used entry is
+# evicted once the cache is full. Each entry also keeps the slip's price
+# report and when it was captured, so repeat lookups can show the prices
+# the code was built at.
+
+
+class ConversionCache:
+    def __init__(self, max_entries=1000, ttl=900):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Function to look up a conversion as {converted_code, price_report, captured_at}, returning None on a miss
+
+    def get(self, booking_code):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(booking_code)
+            if entry is not None and entry[1] <= now:
+                del self._entries[booking_code]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(booking_code)
+            self.hits += 1
+            converted_code, _, price_report, captured_at = entry
+            return {'converted_code': converted_code, 'price_report': price_report,
+                    'captured_at': captured_at}
+
+    # Function to store a converted code; matches are the Sportybet legs it was
+    # built from and price_report the job's per-leg prices at conversion time
+
+    def put(self, booking_code, converted_code, matches, price_report=None):
+        now = time.time()
+        expires_at = now + self.ttl
+        # Sportybet start times are Unix timestamps in milliseconds
+        start_times = [match.start_time / 1000
+                       for match in matches if match.start_time]
+        if start_times:
+            expires_at = min(expires_at, min(start_times))
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[booking_code] = (converted_code, expires_at, price_report, now)
+            self._entries.move_to_end(booking_code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,156 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+# Bounded pool of pre-launched, pre-navigated WebDriver sessions.
+# Drivers are checked out for one conversion and handed back with their
+# betslip reset, so requests no longer pay Chrome cold start every time.
+
+
+class DriverPoolTimeout(Exception):
+    pass
+
+
+class DriverPool:
+    def __init__(self, create_driver, reset_driver, size=2, checkout_timeout=60,
+                 background_limit=None):
+        # create_driver() must return a driver already sitting on the target site
+        # reset_driver(driver) must bring a used driver back to an empty betslip
+        self.create_driver = create_driver
+        self.reset_driver = reset_driver
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        # Drivers background checkouts may hold at once; by default one fewer
+        # than the pool, so interactive callers always have a driver to wait for
+        if background_limit is None:
+            background_limit = max(size - 1, 1)
+        self._background = threading.BoundedSemaphore(background_limit)
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    # Function to launch drivers until the pool is full
+
+    def warm(self):
+        while True:
+            with self._lock:
+                if self._closed or self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                driver = self.create_driver()
+            except Exception as e:
+                with self._lock:
+                    self._created -= 1
+                logging.error(f"Failed to launch pooled driver: {e}")
+                return
+            self._idle.put(driver)
+            logging.info(
+                f"Driver pool warmed: {self._created}/{self.size} drivers launched")
+
+    # Function to warm the pool without blocking the caller
+
+    def warm_in_background(self):
+        thread = threading.Thread(
+            target=self.warm, name="driver-pool-warm", daemon=True)
+        thread.start()
+        return thread
+
+    # Function to take a driver out of the pool, launching one if there is spare capacity.
+    # Background callers pass wait_indefinitely to queue for a driver instead of timing out
+
+    def acquire(self, wait_indefinitely=False):
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            if self._closed:
+                raise DriverPoolTimeout("Driver pool is closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            launch = False
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    launch = True
+            if launch:
+                try:
+                    return self.create_driver()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+            # Indefinite waits still wake up every checkout_timeout, so a slot
+            # freed by a replacement driver that failed to launch gets used
+            remaining = deadline - time.monotonic()
+            if not wait_indefinitely and remaining <= 0:
+                raise DriverPoolTimeout(
+                    f"No driver available after {self.checkout_timeout} seconds")
+            try:
+                return self._idle.get(
+                    timeout=self.checkout_timeout if wait_indefinitely else remaining)
+            except queue.Empty:
+                pass
+
+    # Function to hand a driver back, resetting it or replacing it if it is broken
+
+    def release(self, driver, discard=False):
+        if not discard and not self._closed:
+            try:
+                self.reset_driver(driver)
+                self._idle.put_nowait(driver)
+                return
+            except Exception as e:
+                logging.warning(f"Discarding pooled driver after failed reset: {e}")
+        self._quit(driver)
+        with self._lock:
+            self._created -= 1
+        if not self._closed:
+            self.warm_in_background()
+
+    # Background checkouts (wait_indefinitely) first queue for one of the
+    # background_limit slots, so they can't hold every driver at once
+
+    @contextmanager
+    def checkout(self, wait_indefinitely=False):
+        if wait_indefinitely:
+            self._background.acquire()
+        try:
+            driver = self.acquire(wait_indefinitely)
+            try:
+                yield driver
+            finally:
+                # A failed conversion may leave the page in any state; release()
+                # resets it, and a driver that can't be reset gets replaced
+                self.release(driver)
+        finally:
+            if wait_indefinitely:
+                self._background.release()
+
+    def active_count(self):
+        with self._lock:
+            return self._created - self._idle.qsize()
+
+    # Function to quit every idle driver and stop handing out new ones
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+            with self._lock:
+                self._created -= 1
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Failed to quit driver: {e}")
@@ -0,0 +1,174 @@
+import logging
+import sys
+import threading
+import time
+
+from betpawa_api import BETPAWA_BASE_URL, BetpawaApiError, normalize_name, parse_start_time
+
+# In-memory index of the upcoming Betpawa prematch catalog, keyed by
+# normalized (home, away, kickoff bucket). A background thread refreshes it
+# and only re-fetches event details for events that are new or changed.
+
+BETPAWA_EVENT_PAGE_URL = BETPAWA_BASE_URL + "/event/{event_id}"
+
+# Kickoff times are bucketed so lookups tolerate small clock differences
+KICKOFF_BUCKET_MS = 15 * 60 * 1000
+START_TIME_TOLERANCE_MS = 60000
+
+
+def kickoff_bucket(start_time):
+    return start_time // KICKOFF_BUCKET_MS
+
+
+class CatalogEntry:
+    __slots__ = ('event_id', 'home_team', 'away_team', 'home_key', 'away_key',
+                 'start_time', 'event')
+
+    def __init__(self, event_id, home_team, away_team, start_time, event):
+        self.event_id = event_id
+        # Team names repeat across fixtures, so each is stored once
+        self.home_team = sys.intern(home_team)
+        self.away_team = sys.intern(away_team)
+        self.home_key = sys.intern(normalize_name(home_team))
+        self.away_key = sys.intern(normalize_name(away_team))
+        self.start_time = start_time
+        self.event = event
+
+    @property
+    def url(self):
+        return BETPAWA_EVENT_PAGE_URL.format(event_id=self.event_id)
+
+
+class EventCatalog:
+    def __init__(self, client, refresh_interval=300, on_refresh=None):
+        # on_refresh(catalog) is called after every successful refresh
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.on_refresh = on_refresh
+        self.last_refresh = None
+        # Latest kickoff listed, and whether every listed event made it in;
+        # together they say which fixtures the catalog can vouch for
+        self._horizon = None
+        self._complete = False
+        self._events = {}  # event id -> (fingerprint, entry)
+        self._index = {}  # (home, away, bucket) -> [entry, ...]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Function to pull the upcoming catalog, fetching details only for new or changed events
+
+    def refresh(self):
+        try:
+            listing = self.client.list_upcoming_events()
+        except BetpawaApiError as e:
+            logging.error(f"Failed to refresh Betpawa event catalog: {e}")
+            return
+
+        with self._lock:
+            known = dict(self._events)
+        events = {}
+        fetched = 0
+        skipped = 0
+        for event in listing:
+            event_id = event.get('id')
+            if event_id is None:
+                continue
+            # Prices are read fresh at resolve time, so only a renamed or
+            # rescheduled event needs its details fetched again
+            fingerprint = (event.get('name'), event.get('startTime'))
+            previous = known.get(event_id)
+            if previous is not None and previous[0] == fingerprint:
+                events[event_id] = previous
+                continue
+            try:
+                details = self.client.get_event(event_id)
+            except BetpawaApiError as e:
+                logging.warning(f"Skipping Betpawa event {event_id}: {e}")
+                skipped += 1
+                continue
+            entry = self._make_entry(details)
+            if entry is not None:
+                events[event_id] = (fingerprint, entry)
+                fetched += 1
+
+        index = {}
+        for _, entry in events.values():
+            key = (entry.home_key, entry.away_key,
+                   kickoff_bucket(entry.start_time))
+            index.setdefault(key, []).append(entry)
+        horizon = max((entry.start_time for _, entry in events.values()), default=None)
+        with self._lock:
+            self._events = events
+            self._index = index
+            self._horizon = horizon
+            self._complete = skipped == 0
+            self.last_refresh = time.time()
+        logging.info(
+            f"Betpawa event catalog refreshed: {len(events)} events, {fetched} fetched, {skipped} skipped")
+        if self.on_refresh is not None:
+            self.on_refresh(self)
+
+    def _make_entry(self, event):
+        names = event.get('name', '').split(' - ')
+        if len(names) != 2 or not event.get('startTime'):
+            return None
+        return CatalogEntry(event['id'], names[0], names[1],
+                            parse_start_time(event['startTime']), event)
+
+    # Function to find the catalog entry for a fixture, or None if it isn't indexed
+
+    def lookup(self, home_team, away_team, start_time):
+        home, away = normalize_name(home_team), normalize_name(away_team)
+        now_ms = time.time() * 1000
+        bucket = kickoff_bucket(start_time)
+        with self._lock:
+            # Probe neighbouring buckets so kickoffs near a bucket edge still match
+            for probe in (bucket, bucket - 1, bucket + 1):
+                for entry in self._index.get((home, away, probe), ()):
+                    if entry.start_time <= now_ms:
+                        continue
+                    if abs(entry.start_time - start_time) < START_TIME_TOLERANCE_MS:
+                        return entry
+        return None
+
+    # Function to tell whether a fixture at start_time would be in the catalog
+    # if Betpawa listed it: the last refresh skipped no events and the kickoff
+    # falls inside the listed window
+
+    def covers(self, start_time):
+        with self._lock:
+            return (self._complete and self._horizon is not None
+                    and start_time is not None and start_time <= self._horizon)
+
+    # Function to list every team name in the catalog
+
+    def team_names(self):
+        with self._lock:
+            entries = [entry for _, entry in self._events.values()]
+        names = set()
+        for entry in entries:
+            names.add(entry.home_team)
+            names.add(entry.away_team)
+        return names
+
+    def __len__(self):
+        with self._lock:
+            return len(self._events)
+
+    # Function to keep the catalog fresh on a background thread
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="event-catalog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
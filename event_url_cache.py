@@ -0,0 +1,57 @@
+import threading
+import time
+
+from betpawa_api import normalize_name
+
+# Betpawa event page URLs remembered per fixture the first time the search
+# UI finds them, so later legs on the same fixture open the page directly.
+# Entries are dropped once the match kicks off.
+
+
+class EventUrlCache:
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _key(self, home_team, away_team, start_time):
+        return (normalize_name(home_team), normalize_name(away_team), start_time)
+
+    # Function to return the cached event URL, or None if unknown or kicked off
+
+    def get(self, home_team, away_team, start_time):
+        key = self._key(home_team, away_team, start_time)
+        now_ms = time.time() * 1000
+        with self._lock:
+            url = self._entries.get(key)
+            if url is not None and start_time <= now_ms:
+                del self._entries[key]
+                url = None
+            if url is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return url
+
+    def put(self, home_team, away_team, start_time, url):
+        now_ms = time.time() * 1000
+        if start_time <= now_ms:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict_started(now_ms)
+            if len(self._entries) < self.max_entries:
+                self._entries[self._key(home_team, away_team, start_time)] = url
+
+    # Function to drop every fixture that has already kicked off
+
+    def _evict_started(self, now_ms):
+        started = [key for key in self._entries if key[2] <= now_ms]
+        for key in started:
+            del self._entries[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
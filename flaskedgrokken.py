@@ -1,15 +1,21 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import logging
+import os
 import time
 import requests
 from datetime import datetime
 
+from alias_store import AliasStore
+from betpawa_selectors import (BETSLIP_FILLED, BET_PRICE_BUTTONS,
+                               BOOKING_CODE_LINK, BOOKING_CODE_POPUP,
+                               EVENT_CONTAINER, SEARCH_ICON, SEARCH_INPUT)
+from http_client import get_http_client
+
 app = Flask(__name__)
 CORS(app)
 
@@ -37,12 +43,18 @@ team_mapping = {
     "Man Utd": "Manchester United",
 }
 
+# Aliases learned by flaskedgrokken2.py, opened on first lookup
+alias_store = AliasStore(os.environ.get("ALIAS_DB_PATH", "team_aliases.db"))
+
 # Function to map team names from Sportybet to Betpawa
 
 
 def map_team_name(team_name):
-    mapped_name = team_mapping.get(team_name, team_name)
-    if team_name not in team_mapping:
+    # This script has no fuzzy matcher to check them, so only verified aliases are used
+    alias = alias_store.get(team_name)
+    learned_name = alias[0] if alias is not None and alias[1] else None
+    mapped_name = team_mapping.get(team_name) or learned_name or team_name
+    if mapped_name == team_name:
         logging.warning(
             f"Team name '{team_name}' not found in mapping. Using original name: {mapped_name}.")
     return mapped_name
@@ -54,9 +66,8 @@ def get_sportybet_matches(booking_code):
     url = SPORTYBET_API_URL.format(
         booking_code=booking_code, timestamp=int(datetime.now().timestamp() * 1000))
     try:
-        response = requests.get(url, headers=SPORTYBET_HEADERS, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = get_http_client().get_json(
+            url, headers=SPORTYBET_HEADERS, timeout=10)
     except (requests.exceptions.RequestException, ValueError) as e:
         logging.error(f"Failed to fetch Sportybet matches: {e}")
         return []
@@ -106,14 +117,14 @@ def search_and_select_bet(driver, match):
         # Step 1: Click the search icon
         search_icon = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "svg[data-test-id='headerIconSearch']"))
+                SEARCH_ICON.locator())
         )
         search_icon.click()
 
         # Step 2: Enter the team names in the search bar
         search_bar = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "input[type='text']"))
+                SEARCH_INPUT.locator())
         )
         search_bar.clear()
         search_bar.send_keys(f"{home_team} vs {away_team}")
@@ -122,16 +133,14 @@ def search_and_select_bet(driver, match):
         # Step 3: Wait for the match to appear
         match_container = WebDriverWait(driver, 20).until(
             EC.presence_of_element_located(
-                (By.XPATH,
-                 f"//div[contains(@class, 'events-container prematch')]//div[contains(@class, 'teams') and .//p[contains(text(), '{home_team}')] and .//p[contains(text(), '{away_team}')]]//ancestor::div[contains(@class, 'events-container prematch')]")
+                EVENT_CONTAINER.locator(home_team=home_team, away_team=away_team)
             )
         )
 
         # Step 4: Wait for betting options to load and get the first three spans
         betting_buttons = WebDriverWait(driver, 10).until(
             EC.presence_of_all_elements_located(
-                (By.XPATH,
-                 ".//span[contains(@class, 'event-bet-wrapper') and contains(@class, 'bet-price')]")
+                BET_PRICE_BUTTONS.locator()
             )
         )
 
@@ -155,7 +164,7 @@ def search_and_select_bet(driver, match):
         # Step 6: Verify the bet was added to the bet slip
         WebDriverWait(driver, 5).until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div.betslip-main:not(.empty-betslip)"))
+                BETSLIP_FILLED.locator())
         )
         logging.info(
             f"Added {selection} ({bet_option}) for {home_team} vs {away_team} to bet slip")
@@ -177,7 +186,7 @@ def generate_booking_code(driver):
         # Step 1: Locate and click the "Booking code" link
         booking_code_link = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable(
-                (By.XPATH, "//a[contains(@class, 'underline') and contains(@class, 'booking-code-link') and .//span[contains(text(), 'Booking code')]]")
+                BOOKING_CODE_LINK.locator()
             )
         )
         booking_code_link.click()
@@ -185,7 +194,7 @@ def generate_booking_code(driver):
         # Step 2: Wait for the popup to appear and extract the booking code from the h2 element
         booking_code = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located(
-                (By.XPATH, "//h2")
+                BOOKING_CODE_POPUP.locator()
             )
         ).text
 
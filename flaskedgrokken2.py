@@ -1,15 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, url_for
 from flask_cors import CORS
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import json
 import logging
+import os
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from alias_store import AliasStore
+from batch import run_batch
+from betpawa_api import BETPAWA_BASE_URL, BetpawaApiClient, BetpawaApiError, resolve_leg
+from betpawa_selectors import (BETSLIP_FILLED, BOOKING_CODE_LINK, BOOKING_CODE_POPUP,
+                               EVENT_TEAMS, MARKET_CONTAINER, SEARCH_ICON,
+                               SEARCH_INPUT, get_selector_stats)
+from browser_profile import apply_lean_options, enable_request_blocking
+from conversion_cache import ConversionCache
+from driver_pool import DriverPool
+from event_catalog import BETPAWA_EVENT_PAGE_URL, EventCatalog
+from event_url_cache import EventUrlCache
+from http_client import get_http_client
+from jobs import Job, JobQueue, LEG_RUNNING, LEG_DONE, LEG_FAILED
+from market_snapshot import find_market, snapshot_markets
+from market_table import RULES_BY_MARKET_TYPE, select_button, supports
+from metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
+from readiness import EventWait, get_step_latency, install_network_tracker
+from single_flight import SingleFlight, SqliteLockStore
+from sportybet_parser import parse_share_payload
+from team_resolver import TeamResolver
+
 app = Flask(__name__)
 CORS(app)
 
@@ -17,9 +40,54 @@ CORS(app)
 logging.basicConfig(level=logging.INFO,
                     format="%(asctime)s - %(levelname)s - %(message)s")
 
-# Constants
-SPORTYBET_API_URL = "https://www.sportybet.com/api/tz/orders/share/{booking_code}?_t={timestamp}"
-BETPAWA_BASE_URL = "https://www.betpawa.co.tz"
+# Constants (overridable so benchmarks can point at local replicas;
+# BETPAWA_BASE_URL is read by betpawa_api)
+SPORTYBET_API_URL = os.environ.get(
+    "SPORTYBET_API_URL", "https://www.sportybet.com/api/tz/orders/share/{booking_code}?_t={timestamp}")
+
+# Run conversion browsers without a window
+BROWSER_HEADLESS = os.environ.get("BROWSER_HEADLESS", "0") == "1"
+
+# Block images, fonts, trackers and ads in conversion browsers. Off until
+# benchmark_browser_profile.py has been run against the live site
+BROWSER_LEAN_MODE = os.environ.get("BROWSER_LEAN_MODE", "0") == "1"
+# Extra comma-separated URL patterns to block in lean mode
+BROWSER_BLOCKED_URLS = [pattern for pattern in os.environ.get(
+    "BROWSER_BLOCKED_URLS", "").split(",") if pattern]
+
+# Number of warm Chrome sessions kept for /convert
+DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "2"))
+DRIVER_CHECKOUT_TIMEOUT = int(os.environ.get("DRIVER_CHECKOUT_TIMEOUT", "60"))
+# How long finished conversion jobs stay available on /jobs/<id>
+JOB_RETENTION_SECONDS = int(os.environ.get("JOB_RETENTION_SECONDS", "3600"))
+# Converted codes are reused until the first leg kicks off or this TTL passes
+CONVERSION_CACHE_SIZE = int(os.environ.get("CONVERSION_CACHE_SIZE", "1000"))
+CONVERSION_CACHE_TTL = int(os.environ.get("CONVERSION_CACHE_TTL", "900"))
+# Resolve legs, create bookings and prefetch the event catalog over the Betpawa
+# API before using a browser. Off by default: only the booking-number GET is
+# confirmed, the search, upcoming, event and booking endpoints are not yet
+BETPAWA_API_ENABLED = os.environ.get("BETPAWA_API_ENABLED", "0") == "1"
+# How often the prefetched Betpawa event catalog is refreshed
+EVENT_CATALOG_REFRESH_SECONDS = int(
+    os.environ.get("EVENT_CATALOG_REFRESH_SECONDS", "300"))
+# Minimum confidence for a fuzzy team name match to be used
+TEAM_MATCH_THRESHOLD = float(os.environ.get("TEAM_MATCH_THRESHOLD", "0.6"))
+# SQLite file holding team aliases learned from successful conversions
+ALIAS_DB_PATH = os.environ.get("ALIAS_DB_PATH", "team_aliases.db")
+# Limits for /convert/batch
+BATCH_MAX_CODES = int(os.environ.get("BATCH_MAX_CODES", "200"))
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", "8"))
+# Legs resolved concurrently across all running conversions. Only used with
+# BETPAWA_API_ENABLED: the API is the only resolve backend, so with it off the
+# resolve stage does nothing and every leg is searched one after another on
+# the conversion's single driver
+RESOLVE_WORKERS = int(os.environ.get("RESOLVE_WORKERS", "16"))
+# Seconds between SSE keep-alive comments while a job is quiet
+SSE_KEEPALIVE_SECONDS = int(os.environ.get("SSE_KEEPALIVE_SECONDS", "15"))
+# SQLite file shared by workers so only one converts a given code at a time; empty keeps it per process
+CONVERSION_LOCK_DB_PATH = os.environ.get("CONVERSION_LOCK_DB_PATH", "")
+# Seconds before a conversion lock held by a dead worker is taken over
+CONVERSION_LOCK_TTL = int(os.environ.get("CONVERSION_LOCK_TTL", "300"))
 
 # Headers for Sportybet API
 SPORTYBET_HEADERS = {
@@ -30,6 +98,24 @@ SPORTYBET_HEADERS = {
     "Origin": "https://www.sportybet.com",
 }
 
+# Prometheus metrics served on /metrics
+metrics_registry = MetricsRegistry()
+stage_seconds = metrics_registry.histogram(
+    "conversion_stage_seconds", "Time spent in each conversion stage", ["stage"])
+leg_results = metrics_registry.counter(
+    "conversion_legs_total", "Converted legs by market type and result", ["market", "result"])
+conversion_results = metrics_registry.counter(
+    "conversions_total", "Finished conversions by result", ["result"])
+coalesced_requests = metrics_registry.counter(
+    "conversion_requests_coalesced_total", "Conversion requests that joined a running job")
+
+# Function to return the market label for leg metrics; markets outside the
+# translation table share "other", so upstream data can't grow the label set
+
+
+def market_label(match):
+    return match.market_type if match.market_type in RULES_BY_MARKET_TYPE else "other"
+
 # Team name mapping from Sportybet to Betpawa
 team_mapping = {
     "Man City": "Manchester City",
@@ -54,16 +140,62 @@ team_mapping = {
     "Fulham": "Fulham FC",
 }
 
+# Fuzzy matcher over known Betpawa names, rebuilt whenever the event catalog refreshes
+team_resolver = TeamResolver(team_mapping.values())
+
+# Aliases learned from earlier conversions, opened on first lookup
+alias_store = AliasStore(ALIAS_DB_PATH)
+
+# Function to look up an exact mapping, hard-coded or learned. An alias learned
+# through search alone only found a row containing the names, so it still has
+# to clear the match threshold
+
+
+def get_known_alias(team_name):
+    if team_name in team_mapping:
+        return team_mapping[team_name]
+    alias = alias_store.get(team_name)
+    if alias is None:
+        return None
+    target, verified = alias
+    if verified or team_resolver.score(team_name, target) >= TEAM_MATCH_THRESHOLD:
+        return target
+    return None
+
 # Function to map team names from Sportybet to Betpawa
 
 
 def map_team_name(team_name):
-    mapped_name = team_mapping.get(team_name, team_name)
-    if team_name not in team_mapping:
+    known_name = get_known_alias(team_name)
+    if known_name is not None:
+        return known_name
+    mapped_name, score = team_resolver.resolve(team_name)
+    if mapped_name is None or score < TEAM_MATCH_THRESHOLD:
         logging.warning(
-            f"No mapping found for team: {team_name}. Using original name: {mapped_name}")
+            f"No mapping found for team: {team_name}. Using original name: {team_name}")
+        return team_name
     return mapped_name
 
+# Function to list the team names on a slip that can't be matched confidently
+
+
+def find_unresolved_teams(matches):
+    unresolved = []
+    for match in matches:
+        for team_name in (match.home_team, match.away_team):
+            if get_known_alias(team_name) is not None:
+                continue
+            mapped_name, score = team_resolver.resolve(team_name)
+            if mapped_name is None or score < TEAM_MATCH_THRESHOLD:
+                unresolved.append(team_name)
+    return unresolved
+
+# Function to rebuild the team resolver from the latest Betpawa catalog
+
+
+def refresh_team_resolver(catalog):
+    team_resolver.rebuild(set(team_mapping.values()) | catalog.team_names())
+
 # Function to fetch and parse Sportybet matches
 
 
@@ -71,183 +203,164 @@ def get_sportybet_matches(booking_code):
     url = SPORTYBET_API_URL.format(
         booking_code=booking_code, timestamp=int(datetime.now().timestamp() * 1000))
     try:
-        response = requests.get(url, headers=SPORTYBET_HEADERS, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        with stage_seconds.time(stage="sportybet_fetch"):
+            body = get_http_client().get_bytes(
+                url, headers=SPORTYBET_HEADERS, timeout=10)
+        return parse_share_payload(body)
     except (requests.exceptions.RequestException, ValueError) as e:
         logging.error(f"Failed to fetch Sportybet matches: {e}")
         return []
 
-    matches = []
-    for outcome in data.get('data', {}).get('outcomes', []):
-        match = {
-            'event_id': outcome.get('eventId'),
-            'home_team': outcome.get('homeTeamName', '').strip(),
-            'away_team': outcome.get('awayTeamName', '').strip(),
-            'start_time': outcome.get('estimateStartTime'),
-            'market': None,  # e.g., "1X2", "Over/Under 0.5", "BTTS"
-            'selection': None,  # e.g., "Home", "Over 0.5", "Yes"
-            'odds': {}
-        }
-        for market in outcome.get('markets', []):
-            market_desc = market.get('desc')
-            # Handle 1X2 market
-            if market_desc == '1X2':
-                for outcome_data in market.get('outcomes', []):
-                    match['market'] = '1X2'
-                    match['selection'] = outcome_data.get(
-                        'desc')  # e.g., "Home", "Draw", "Away"
-                    match['odds'][outcome_data.get('desc')] = float(
-                        outcome_data.get('odds', 0))
-            # Handle Over/Under markets dynamically
-            elif market_desc == 'Over/Under':
-                specifier = market.get('specifier', '')  # e.g., "total=0.5"
-                # Default to 2.5 if not specified
-                threshold = specifier.split(
-                    '=')[1] if '=' in specifier else '2.5'
-                for outcome_data in market.get('outcomes', []):
-                    # e.g., "Over/Under 0.5"
-                    match['market'] = f'Over/Under {threshold}'
-                    match['selection'] = outcome_data.get(
-                        'desc')  # e.g., "Over 0.5", "Under 2.5"
-                    match['odds'][outcome_data.get('desc')] = float(
-                        outcome_data.get('odds', 0))
-            # Handle Both Teams to Score market (GG/NG)
-            elif market_desc == 'GG/NG':
-                for outcome_data in market.get('outcomes', []):
-                    match['market'] = 'BTTS'
-                    match['selection'] = outcome_data.get(
-                        'desc')  # e.g., "Yes", "No"
-                    match['odds'][outcome_data.get('desc')] = float(
-                        outcome_data.get('odds', 0))
-        if match['market'] and match['selection']:
-            matches.append(match)
-    return matches
-
 # Function to initialize the Selenium WebDriver
 
 
 def initialize_driver():
     options = webdriver.ChromeOptions()
     options.add_argument("--start-maximized")  # Maximize the browser window
+    if BROWSER_HEADLESS:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    if BROWSER_LEAN_MODE:
+        apply_lean_options(options)
     # Ensure ChromeDriver is installed
     driver = webdriver.Chrome(options=options)
+    if BROWSER_LEAN_MODE:
+        enable_request_blocking(driver, BROWSER_BLOCKED_URLS)
+    return driver
+
+# Function to launch a driver for the pool, already sitting on the Betpawa homepage
+
+
+def create_pooled_driver():
+    with stage_seconds.time(stage="driver_startup"):
+        driver = initialize_driver()
+        install_network_tracker(driver)
+        driver.get(BETPAWA_BASE_URL)
+        # Hand the driver out only once the homepage has finished its API calls
+        try:
+            EventWait(driver, 20, step="homepage_network_idle").until_network_idle()
+        except TimeoutException:
+            logging.warning("Betpawa homepage still busy after 20s, using driver anyway")
     return driver
 
-# Function to search for a match and select a bet on Betpawa
+# Function to empty the betslip of a used driver before it goes back to the pool
+
+
+def reset_driver(driver):
+    # Betpawa keeps the betslip in browser storage, so clearing it empties the slip
+    driver.execute_script(
+        "window.localStorage.clear(); window.sessionStorage.clear();")
+    driver.delete_all_cookies()
+    driver.get(BETPAWA_BASE_URL)
+    SEARCH_ICON.wait(driver, 10, step="reset_homepage")
+
+
+driver_pool = DriverPool(create_pooled_driver, reset_driver,
+                         size=DRIVER_POOL_SIZE,
+                         checkout_timeout=DRIVER_CHECKOUT_TIMEOUT)
+
+# Event page URLs found through search, kept until each match kicks off
+event_url_cache = EventUrlCache()
 
+# Function to open a match's event page through the Betpawa search UI
 
-def search_and_select_bet(driver, match):
-    home_team = map_team_name(match['home_team'])
-    away_team = map_team_name(match['away_team'])
-    market = match['market']
-    selection = match['selection']
+
+def open_event_via_search(driver, home_team, away_team):
+    # Step 1: Click the search icon
+    search_icon = SEARCH_ICON.wait(driver, 10, clickable=True)
+    search_icon.click()
+
+    # Step 2: Enter the mapped team names in the search bar
+    search_bar = SEARCH_INPUT.wait(driver, 10, step="search_bar")
+    search_bar.clear()
+    search_bar.send_keys(f"{home_team} vs {away_team}")
+    search_bar.send_keys(Keys.RETURN)
+
+    # Step 3: Locate the div containing the team names and click it
+    team_div = EVENT_TEAMS.wait(driver, 20, clickable=True, step="team_div",
+                                home_team=home_team, away_team=away_team)
+    logging.info(f"Found team div for {home_team} vs {away_team}")
+    team_div.click()
+
+# Function to search for a match and select a bet on Betpawa, returning the Betpawa price of the clicked outcome
+
+
+def search_and_select_bet(driver, match, event_url=None):
+    home_team = map_team_name(match.home_team)
+    away_team = map_team_name(match.away_team)
+    market = match.market
+    selection = match.selection
     try:
-        # Step 1: Click the search icon
-        search_icon = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "svg[data-test-id='headerIconSearch']"))
-        )
-        search_icon.click()
-
-        # Step 2: Enter the mapped team names in the search bar
-        search_bar = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "input[type='text']"))
-        )
-        search_bar.clear()
-        search_bar.send_keys(f"{home_team} vs {away_team}")
-        search_bar.send_keys(Keys.RETURN)
-
-        # Step 3: Locate the div containing the team names and click it
-        team_div = WebDriverWait(driver, 20).until(
-            EC.element_to_be_clickable(
-                (By.XPATH,
-                 f"//div[contains(@class, 'events-container prematch')]//div[contains(@class, 'teams') and .//p[contains(text(), '{home_team}')] and .//p[contains(text(), '{away_team}')]]")
-            )
-        )
-        logging.info(
-            f"Found team div for {home_team} vs {away_team}: {team_div.get_attribute('outerHTML')}")
-        team_div.click()
+        # Look the market up first, so an unsupported leg fails before any browser work
+        if not supports(match):
+            raise ValueError(f"Unsupported market: {market} - {selection}")
+        rule = RULES_BY_MARKET_TYPE[match.market_type]
+
+        # Steps 1-3: Open the event page directly when the event is already
+        # known (resolved leg, earlier search or the catalog), else search for it.
+        # Only a resolved leg or a catalog hit has had its kickoff checked
+        start_time = match.start_time
+        kickoff_verified = event_url is not None
+        if event_url is None and start_time:
+            event_url = event_url_cache.get(home_team, away_team, start_time)
+        if event_url is None and start_time:
+            catalog_entry = event_catalog.lookup(
+                home_team, away_team, start_time)
+            if catalog_entry is not None:
+                event_url = catalog_entry.url
+                kickoff_verified = True
+        searched = event_url is None
+        with stage_seconds.time(stage="search" if searched else "open_event"):
+            if searched:
+                open_event_via_search(driver, home_team, away_team)
+            else:
+                driver.get(event_url)
 
         # Step 4: Determine the market title to look for
-        if market == '1X2':
-            market_title = "1X2 | Full Time"
-        elif market.startswith('Over/Under'):
-            market_title = "Over/Under | Full Time"
-        elif market == 'BTTS':
-            market_title = "Both Teams To Score | Full Time"
-        else:
-            raise ValueError(f"Unsupported market: {market}")
-
-        # Step 5: Find the events-container div with the correct market title
-        market_container = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located(
-                (By.XPATH,
-                 f"//div[contains(@class, 'events-container')]//h4[contains(text(), '{market_title}')]//ancestor::div[contains(@class, 'events-container')]")
-            )
-        )
+        market_title = rule.betpawa_title
+
+        # Step 5: Wait for the events-container div with the correct market title
+        market_lookup_start = time.perf_counter()
+        MARKET_CONTAINER.wait(driver, 10, market_title=market_title)
+
+        # The event page is open now, so later legs on this fixture can skip the search
+        if searched and start_time:
+            event_url_cache.put(home_team, away_team,
+                                start_time, driver.current_url)
+
+        # Step 6: Read every market and its betting options in one round trip
+        market_snapshot = find_market(snapshot_markets(driver), market_title)
+        if market_snapshot is None:
+            raise Exception(
+                f"Market {market_title} disappeared for {home_team} vs {away_team}")
+        betting_buttons = market_snapshot['outcomes']
+        stage_seconds.observe(time.perf_counter() -
+                              market_lookup_start, stage="market_lookup")
         logging.info(
-            f"Found market container for {market_title}: {market_container.get_attribute('outerHTML')}")
-
-        # Step 6: Locate the betting options (spans) within the market container
-        betting_buttons = market_container.find_elements(
-            By.XPATH,
-            ".//span[contains(@class, 'event-bet-wrapper') and contains(@class, 'bet-price')]"
-        )
-
-        # Step 7: Make the selection based on the market type
-        if market == '1X2':
-            if len(betting_buttons) < 3:
-                raise Exception(
-                    f"Expected at least 3 betting buttons for {home_team} vs {away_team} (1X2), but found {len(betting_buttons)}")
-
-            selection_map = {"Home": "1", "Draw": "X", "Away": "2"}
-            bet_option = selection_map[selection]
-            button_index_map = {"1": 0, "X": 1, "2": 2}
-            button_index = button_index_map[bet_option]
-
-        elif market.startswith('Over/Under'):
-            threshold = market.split(' ')[1]  # e.g., "0.5", "2.5"
-            if len(betting_buttons) < 2:
-                raise Exception(
-                    f"Expected at least 2 betting buttons for {home_team} vs {away_team} (Over/Under {threshold}), but found {len(betting_buttons)}")
-
-            # Construct the expected label: "Over (0.5)" or "Under (2.5)"
-            over_or_under = selection.split(' ')[0]  # "Over" or "Under"
-            expected_label = f"{over_or_under} ({threshold})"
-
-            # Find the button with the expected label
-            button_index = None
-            for i, button in enumerate(betting_buttons):
-                button_text = button.text.lower()
-                if expected_label.lower() in button_text:
-                    button_index = i
-                    break
-            if button_index is None:
-                raise Exception(
-                    f"Could not find betting button for {expected_label} in Over/Under {threshold} for {home_team} vs {away_team}")
-
-        elif market == 'BTTS':
-            if len(betting_buttons) < 2:
-                raise Exception(
-                    f"Expected at least 2 betting buttons for {home_team} vs {away_team} (BTTS), but found {len(betting_buttons)}")
-
-            button_index_map = {"Yes": 0, "No": 1}
-            button_index = button_index_map[selection]
+            f"Found market container for {market_title}: {[button['text'] for button in betting_buttons]}")
+
+        # Step 7: Pick the button for the selection from the translation table
+        button_index = select_button(rule, match, betting_buttons)
 
         # Step 8: Click the corresponding button
         bet_button = betting_buttons[button_index]
-        logging.info(f"Clicking bet button: {bet_button.text}")
-        bet_button.click()
-
-        # Step 9: Verify the bet was added to the bet slip
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div.betslip-main:not(.empty-betslip)"))
-        )
+        logging.info(f"Clicking bet button: {bet_button['text']}")
+        with stage_seconds.time(stage="click"):
+            bet_button['element'].click()
+
+            # Step 9: Verify the bet was added to the bet slip
+            BETSLIP_FILLED.wait(driver, 5, step="betslip_confirm")
         logging.info(
             f"Added {market} - {selection} for {home_team} vs {away_team} to bet slip")
+
+        # The names found the right fixture, so remember them for next time.
+        # Search matches any row containing the names, so a fuzzy guess that
+        # found the event that way is kept unverified and still has to clear
+        # the threshold when it is looked up
+        alias_store.record(match.home_team, home_team, verified=kickoff_verified)
+        alias_store.record(match.away_team, away_team, verified=kickoff_verified)
+        # Read in the same snapshot that located the button
+        return bet_button['price']
     except Exception as e:
         logging.error(f"Failed to add bet for {home_team} vs {away_team}: {e}")
         raise
@@ -255,20 +368,19 @@ def search_and_select_bet(driver, match):
 
 
 def generate_booking_code(driver):
+    with stage_seconds.time(stage="booking_code"):
+        return _generate_booking_code(driver)
+
+
+def _generate_booking_code(driver):
     try:
         # Step 1: Locate and click the "Booking code" link
-        booking_code_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable(
-                (By.XPATH, "//a[contains(@class, 'underline') and contains(@class, 'booking-code-link') and .//span[contains(text(), 'Booking code')]]")
-            )
-        )
+        booking_code_link = BOOKING_CODE_LINK.wait(
+            driver, 10, clickable=True)
         booking_code_link.click()
 
         # Step 2: Wait for the popup to appear and extract the booking code from the h2 element
-        booking_code = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located(
-                (By.XPATH, "//h2"))
-        ).text
+        booking_code = BOOKING_CODE_POPUP.wait(driver, 10).text
 
         logging.info(f"Successfully extracted booking code: {booking_code}")
         return booking_code
@@ -277,6 +389,257 @@ def generate_booking_code(driver):
         logging.error(f"Failed to generate booking code: {e}")
         raise
 
+# Function to run one conversion job on a worker thread
+
+
+def run_conversion(job):
+    try:
+        with stage_seconds.time(stage="total"):
+            betpawa_code = convert_once(job, lambda: _run_conversion(job))
+    except Exception:
+        conversion_results.inc(result="failure")
+        raise
+    conversion_results.inc(result="success")
+    return betpawa_code
+
+# Function to run convert() as the only conversion of the job's code across
+# workers sharing the lock store; a job that waited on another conversion
+# instead is filled in from its outcome (legs, Betpawa prices and cache)
+
+
+def convert_once(job, convert, matches=None):
+    led = []
+
+    def lead():
+        led.append(True)
+        betpawa_code = convert()
+        return {'converted_code': betpawa_code,
+                'betpawa_prices': [leg['betpawa_price'] for leg in job.price_report()['legs']]}
+
+    outcome = conversion_flight.run(job.booking_code, lead)
+    if not led:
+        logging.info(
+            f"Booking code {job.booking_code} was converted by another request")
+        if matches is None:
+            matches = get_sportybet_matches(job.booking_code)
+        if not job.legs:
+            job.set_legs(matches)
+        for index, price in enumerate(outcome['betpawa_prices'][:len(job.legs)]):
+            job.update_leg(index, LEG_DONE, betpawa_price=price)
+        conversion_cache.put(job.booking_code, outcome['converted_code'], matches,
+                             job.price_report())
+    return outcome['converted_code']
+
+
+def _run_conversion(job):
+    # Fetch matches from Sportybet
+    matches = get_sportybet_matches(job.booking_code)
+    if not matches:
+        raise ValueError(
+            "No matches found for the given SportyBet booking code")
+    job.set_legs(matches)
+
+    # A slip can't be booked without some of its legs, so fail legs on markets
+    # the translation table doesn't cover, or with no selected outcome, before
+    # any Betpawa work
+    unsupported = [index for index, match in enumerate(matches)
+                   if not supports(match)]
+    if unsupported:
+        for index in unsupported:
+            match = matches[index]
+            error = f"Unsupported market: {match.market} - {match.selection}" if match.selection \
+                else f"No selected outcome in {match.market}"
+            job.update_leg(index, LEG_FAILED, error=error)
+            leg_results.inc(market=market_label(match), result="failure")
+        raise ValueError(
+            f"Unsupported markets on slip: {', '.join(sorted({matches[index].market for index in unsupported}))}")
+
+    # An unmatched name on a fixture the catalog covers can't be on Betpawa,
+    # so fail now instead of after the 20 second search timeout. Legs outside
+    # the catalog's window, or after a partial refresh, are left to search,
+    # flagged up front so clients see which leg is likely to fail
+    covered = [match for match in matches
+               if event_catalog.covers(match.start_time)]
+    unresolved = find_unresolved_teams(covered)
+    if unresolved:
+        for index, match in enumerate(matches):
+            if match in covered and (match.home_team in unresolved or match.away_team in unresolved):
+                job.update_leg(index, LEG_FAILED,
+                               error="Team not found on Betpawa")
+                leg_results.inc(market=market_label(match), result="failure")
+        raise ValueError(
+            f"Could not match teams on Betpawa: {', '.join(unresolved)}")
+    for index, match in enumerate(matches):
+        if match in covered:
+            continue
+        uncertain = find_unresolved_teams([match])
+        if uncertain:
+            logging.warning(
+                f"Searching with low-confidence team names: {', '.join(uncertain)}")
+            job.warn_leg(index, f"Low-confidence team match: {', '.join(uncertain)}")
+
+    # Resolve stage: find every leg's Betpawa event and outcome concurrently
+    with stage_seconds.time(stage="resolve"):
+        resolved = resolve_legs(job, matches)
+
+    # Commit stage: book over the API when every leg resolved, otherwise
+    # add the legs to one browser betslip, skipping search for resolved ones
+    betpawa_code = None
+    if all(resolved):
+        with stage_seconds.time(stage="api_booking"):
+            betpawa_code = book_resolved_legs(matches, resolved)
+    if betpawa_code is None:
+        betpawa_code = convert_via_browser(job, matches, resolved)
+    else:
+        for index, (match, leg) in enumerate(zip(matches, resolved)):
+            job.update_leg(index, LEG_DONE, betpawa_price=leg['price'])
+            leg_results.inc(market=market_label(match), result="success")
+
+    conversion_cache.put(job.booking_code, betpawa_code, matches, job.price_report())
+    return betpawa_code
+
+
+# Function to resolve every leg concurrently; None marks a leg the API couldn't resolve
+
+
+def resolve_legs(job, matches):
+    # No browser-based resolve backend: until the API endpoints are confirmed
+    # and enabled, the slip takes the sum of its legs' search times
+    if not BETPAWA_API_ENABLED:
+        return [None] * len(matches)
+
+    def resolve(index):
+        match = matches[index]
+        job.update_leg(index, LEG_RUNNING)
+        try:
+            leg = resolve_match(match)
+        except Exception as e:
+            logging.warning(
+                f"Failed to resolve {match.home_team} vs {match.away_team}: {e}")
+            leg = None
+        if leg is None:
+            logging.info(
+                f"Betpawa API could not resolve {match.home_team} vs {match.away_team} ({match.market}), leaving it to the browser")
+        return leg
+
+    return list(resolve_pool.map(resolve, range(len(matches))))
+
+# Function to resolve one leg over the Betpawa API, returning None if it needs the browser
+
+
+def resolve_match(match):
+    if not BETPAWA_API_ENABLED:
+        return None
+    return resolve_leg(betpawa_client, match, map_team_name(
+        match.home_team), map_team_name(match.away_team), catalog=event_catalog)
+
+# Function to create a booking from API-resolved legs, returning None if the API call fails
+
+
+def book_resolved_legs(matches, resolved):
+    try:
+        betpawa_code = betpawa_client.create_booking(
+            [leg['price_id'] for leg in resolved])
+    except BetpawaApiError as e:
+        logging.warning(f"Betpawa API booking failed, falling back to browser: {e}")
+        return None
+    for match, leg in zip(matches, resolved):
+        alias_store.record(match.home_team, leg['home_team'])
+        alias_store.record(match.away_team, leg['away_team'])
+    logging.info(f"Created booking code {betpawa_code} over the Betpawa API")
+    return betpawa_code
+
+# Function to convert a slip by clicking through Betpawa in a pooled browser
+
+
+def convert_via_browser(job, matches, resolved=None, wait_indefinitely=False):
+    resolved = resolved or [None] * len(matches)
+    # Borrow a warm Selenium WebDriver from the pool
+    checkout_start = time.perf_counter()
+    with driver_pool.checkout(wait_indefinitely) as driver:
+        stage_seconds.observe(time.perf_counter() -
+                              checkout_start, stage="driver_checkout")
+        # Process each match
+        for index, (match, leg) in enumerate(zip(matches, resolved)):
+            job.update_leg(index, LEG_RUNNING)
+            event_url = None
+            if leg is not None:
+                event_url = BETPAWA_EVENT_PAGE_URL.format(
+                    event_id=leg['event_id'])
+            try:
+                betpawa_price = search_and_select_bet(
+                    driver, match, event_url=event_url)
+            except Exception as e:
+                job.update_leg(index, LEG_FAILED, error=e)
+                leg_results.inc(market=market_label(match), result="failure")
+                raise
+            job.update_leg(index, LEG_DONE, betpawa_price=betpawa_price)
+            leg_results.inc(market=market_label(match), result="success")
+
+        # Generate the Betpawa booking code
+        return generate_booking_code(driver)
+
+
+betpawa_client = BetpawaApiClient()
+# Shared by every job's resolve stage
+resolve_pool = ThreadPoolExecutor(
+    max_workers=RESOLVE_WORKERS, thread_name_prefix="resolve")
+event_catalog = EventCatalog(betpawa_client,
+                             refresh_interval=EVENT_CATALOG_REFRESH_SECONDS,
+                             on_refresh=refresh_team_resolver)
+conversion_cache = ConversionCache(max_entries=CONVERSION_CACHE_SIZE,
+                                   ttl=CONVERSION_CACHE_TTL)
+conversion_flight = SingleFlight(
+    store=SqliteLockStore(CONVERSION_LOCK_DB_PATH) if CONVERSION_LOCK_DB_PATH else None,
+    lock_ttl=CONVERSION_LOCK_TTL, wait_timeout=CONVERSION_LOCK_TTL)
+
+# Conversions run here, off the HTTP worker threads
+job_queue = JobQueue(run_conversion, workers=DRIVER_POOL_SIZE,
+                     retention=JOB_RETENTION_SECONDS)
+
+metrics_registry.gauge("driver_pool_active_drivers",
+                       "Pooled drivers currently checked out", driver_pool.active_count)
+metrics_registry.gauge("driver_pool_size",
+                       "Configured number of pooled drivers", lambda: DRIVER_POOL_SIZE)
+metrics_registry.gauge("job_queue_depth",
+                       "Conversion jobs waiting for a worker", job_queue.queue_depth)
+metrics_registry.gauge("conversions_in_flight",
+                       "Booking codes being converted in this process", conversion_flight.in_flight)
+
+# Function to warm the driver pool and start the catalog refresh, once per
+# process. WSGI servers never run __main__, so the first request starts them
+# if nothing did earlier; a server's worker start hook (e.g. gunicorn's
+# post_worker_init) can call this to warm up before the first request
+
+_background_lock = threading.Lock()
+_background_started = False
+
+
+def start_background_services():
+    global _background_started
+    with _background_lock:
+        if _background_started:
+            return
+        _background_started = True
+    driver_pool.warm_in_background()
+    if BETPAWA_API_ENABLED:
+        event_catalog.start()
+
+
+@app.before_request
+def ensure_background_services():
+    if not _background_started:
+        start_background_services()
+
+# Function to build the response fields for a cached conversion: the code, the
+# per-leg prices and combined odds it was built at, and when those were read
+
+
+def cached_result(cached):
+    return {"converted_code": cached['converted_code'],
+            **(cached['price_report'] or {}),
+            "prices_captured_at": cached['captured_at']}
+
 # API endpoint to convert SportyBet code to Betpawa code
 
 
@@ -290,29 +653,164 @@ def convert_betting_code():
         booking_code = data['booking_code']
         logging.info(f"Received booking code: {booking_code}")
 
-        # Initialize Selenium WebDriver
-        driver = initialize_driver()
-        driver.get("https://www.betpawa.co.tz/")
+        # Answer repeat codes from the cache without touching a browser
+        cached = conversion_cache.get(booking_code)
+        if cached is not None:
+            logging.info(f"Cache hit for booking code: {booking_code}")
+            return jsonify({"status": "done", "cached": True, **cached_result(cached)})
+
+        # Queue the conversion and hand back the job id straight away; a code
+        # that is already converting hands back the running job
+        job, coalesced = job_queue.submit(booking_code)
+        if coalesced:
+            coalesced_requests.inc()
+        return jsonify({
+            "job_id": job.id,
+            "status": job.status,
+            "coalesced": coalesced,
+            "status_url": url_for('get_job', job_id=job.id),
+            "events_url": url_for('stream_job_events', job_id=job.id),
+        }), 202
+    except Exception as e:
+        logging.error(f"Conversion failed: {e}")
+        return jsonify({"error": str(e)}), 500
 
-        # Fetch matches from Sportybet
-        matches = get_sportybet_matches(booking_code)
-        if not matches:
-            driver.quit()
-            return jsonify({"error": "No matches found for the given SportyBet booking code"}), 400
+# Function to build one batch slip from its shared, already resolved legs, returning the code and its price report
+
+
+def assemble_batch_slip(booking_code, matches, resolved):
+    job = Job(booking_code)
+    job.set_legs(matches)
+    # A /convert or another batch converting the same code is joined, not repeated
+    betpawa_code = convert_once(
+        job, lambda: _assemble_batch_slip(job, matches, resolved), matches)
+    return betpawa_code, job.price_report()
+
+
+def _assemble_batch_slip(job, matches, resolved):
+    unsupported = sorted({match.market for match in matches if not supports(match)})
+    if unsupported:
+        raise ValueError(
+            f"Unsupported markets on slip: {', '.join(unsupported)}")
+    betpawa_code = None
+    if all(resolved):
+        betpawa_code = book_resolved_legs(matches, resolved)
+    if betpawa_code is None:
+        # Batches hold more slips than the pool has drivers, so browser-bound
+        # slips queue for one rather than failing after the interactive timeout.
+        # The pool keeps at least one driver out of their reach for /convert
+        betpawa_code = convert_via_browser(
+            job, matches, resolved, wait_indefinitely=True)
+    else:
+        for index, leg in enumerate(resolved):
+            job.update_leg(index, LEG_DONE, betpawa_price=leg['price'])
+    conversion_cache.put(job.booking_code, betpawa_code, matches, job.price_report())
+    return betpawa_code
+
+# API endpoint to convert many SportyBet codes, streamed back as NDJSON
+
+
+@app.route('/convert/batch', methods=['POST'])
+def convert_batch():
+    data = request.get_json(silent=True)
+    booking_codes = data.get('booking_codes') if isinstance(data, dict) else None
+    if not isinstance(booking_codes, list) or not booking_codes:
+        return jsonify({"error": "Missing booking_codes"}), 400
+    if not all(isinstance(booking_code, str) for booking_code in booking_codes):
+        return jsonify({"error": "booking_codes must be a list of strings"}), 400
+    # Duplicate codes in one request are converted once
+    booking_codes = list(dict.fromkeys(booking_codes))
+    if len(booking_codes) > BATCH_MAX_CODES:
+        return jsonify({"error": f"At most {BATCH_MAX_CODES} booking codes per batch"}), 400
+    logging.info(f"Received batch of {len(booking_codes)} booking codes")
+
+    def generate():
+        uncached = []
+        for booking_code in booking_codes:
+            cached = conversion_cache.get(booking_code)
+            if cached is None:
+                uncached.append(booking_code)
+            else:
+                yield json.dumps({"booking_code": booking_code, "cached": True,
+                                  **cached_result(cached)}) + "\n"
+        for result in run_batch(uncached, get_sportybet_matches, resolve_match,
+                                assemble_batch_slip, workers=BATCH_WORKERS):
+            yield json.dumps(result) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+# API endpoint to poll a conversion job
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job.to_dict())
+
+# API endpoint to stream a conversion job's progress as Server-Sent Events
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    # Reconnecting clients resume after the last event they saw; a missing
+    # or malformed id replays the stream from the start
+    try:
+        position = max(int(request.headers.get('Last-Event-ID', -1)) + 1, 0)
+    except ValueError:
+        position = 0
 
-        # Process each match
-        for match in matches:
-            search_and_select_bet(driver, match)
+    def generate(position):
+        while True:
+            events, finished = job.wait_for_events(
+                position, timeout=SSE_KEEPALIVE_SECONDS)
+            if not events and not finished:
+                yield ": keep-alive\n\n"
+            for event in events:
+                yield f"id: {position}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+                position += 1
+            if finished:
+                return
 
-        # Generate and return the Betpawa booking code
-        betpawa_code = generate_booking_code(driver)
-        driver.quit()
+    return Response(stream_with_context(generate(position)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
-        return jsonify({"converted_code": betpawa_code})
-    except Exception as e:
-        logging.error(f"Conversion failed: {e}")
-        return jsonify({"error": str(e)}), 500
+# API endpoint to report conversion cache hit/miss counters
+
+
+@app.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify(conversion_cache.stats())
+
+# API endpoint to report how long each browser wait step takes
+
+
+@app.route('/stats/steps', methods=['GET'])
+def get_step_stats():
+    return jsonify(get_step_latency())
+
+# API endpoint to expose conversion metrics in the Prometheus text format
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+# API endpoint to report lookups, fallback hits and latency per selector
+
+
+@app.route('/stats/selectors', methods=['GET'])
+def get_selectors_stats():
+    return jsonify(get_selector_stats())
 
 
 if __name__ == '__main__':
+    # The debug reloader runs this module in a watcher process too; only the
+    # child that serves requests should launch browsers and poll the catalog
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_services()
     app.run(debug=True, host='0.0.0.0', port=5000)
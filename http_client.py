@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 and native asyncio support need httpx
+    httpx = None
+
+# Shared HTTP client for every outbound bookmaker call. It keeps connections
+# alive in a per-host pool and retries transient failures (connection
+# errors, timeouts, retryable statuses) of idempotent requests with jittered
+# exponential backoff. Both sync and asyncio interfaces are provided; HTTP/2
+# is used when requested and httpx (with the h2 extra) is installed.
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Only these are retried unless the caller opts in; repeating a POST such as
+# a booking could create it twice
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class HttpClientError(requests.exceptions.RequestException):
+    pass
+
+
+class HttpClient:
+    def __init__(self, max_connections_per_host=10, retries=3, backoff=0.3,
+                 max_backoff=5.0, timeout=10, http2=False):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and httpx is not None
+        if http2 and httpx is None:
+            logging.warning("httpx is not installed, falling back to HTTP/1.1")
+
+        if self.http2:
+            self._sync = httpx.Client(http2=True, timeout=timeout, limits=httpx.Limits(
+                max_keepalive_connections=max_connections_per_host))
+        else:
+            self._sync = requests.Session()
+            # pool_block caps concurrent connections to each host
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=max_connections_per_host,
+                                  pool_block=True)
+            self._sync.mount("https://", adapter)
+            self._sync.mount("http://", adapter)
+        self._async = None
+
+    # Function to compute the sleep before the next attempt (full jitter)
+
+    def _delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def _should_retry(self, status_code, attempt, retries):
+        return status_code in RETRY_STATUSES and attempt < retries
+
+    # Function to return how many retries a request gets: all of them for idempotent
+    # methods, none for others unless the caller passes retry=True
+
+    def _retries_for(self, method, retry):
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        return self.retries if retry else 0
+
+    # Function to send a request, retrying connection errors, timeouts and retryable statuses
+
+    def request(self, method, url, retry=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        retries = self._retries_for(method, retry)
+        attempt = 0
+        while True:
+            try:
+                response = self._sync.request(method, url, **kwargs)
+            except Exception as e:
+                # Malformed URLs, bad schemas and the like fail the same way every time
+                if not self._is_transient_error(e):
+                    raise
+                if attempt >= retries:
+                    raise HttpClientError(f"{method} {url} failed: {e}")
+                logging.warning(
+                    f"{method} {url} failed ({e}), retry {attempt + 1}/{retries}")
+            else:
+                if not self._should_retry(response.status_code, attempt, retries):
+                    return response
+                logging.warning(
+                    f"{method} {url} returned {response.status_code}, retry {attempt + 1}/{retries}")
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    # Function to send a request and decode the JSON body, raising HttpClientError on HTTP errors
+
+    def request_json(self, method, url, **kwargs):
+        return self._checked(self.request(method, url, **kwargs), method, url).json()
+
+    def get_json(self, url, **kwargs):
+        return self.request_json("GET", url, **kwargs)
+
+    # Function to GET the raw body bytes, for callers that decode it themselves
+
+    def get_bytes(self, url, **kwargs):
+        return self._checked(self.request("GET", url, **kwargs), "GET", url).content
+
+    def _checked(self, response, method, url):
+        if response.status_code >= 400:
+            raise HttpClientError(
+                f"{method} {url} returned HTTP {response.status_code}")
+        return response
+
+    def post_json(self, url, **kwargs):
+        return self.request_json("POST", url, **kwargs)
+
+    def _is_transient_error(self, error):
+        if isinstance(error, requests.exceptions.SSLError):
+            return False
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return True
+        return httpx is not None and isinstance(
+            error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+    # Function to send a request from asyncio code
+
+    async def arequest(self, method, url, retry=None, **kwargs):
+        if httpx is None:
+            # Without httpx the pooled sync client runs on a worker thread
+            return await asyncio.to_thread(self.request, method, url, retry=retry, **kwargs)
+        if self._async is None:
+            self._async = httpx.AsyncClient(http2=self.http2, timeout=self.timeout, limits=httpx.Limits(
+                max_connections=self.max_connections_per_host * 20,
+                max_keepalive_connections=self.max_connections_per_host))
+        retries = self._retries_for(method, retry)
+        attempt = 0
+        while True:
+            try:
+                response = await self._async.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if not self._is_transient_error(e):
+                    raise
+                if attempt >= retries:
+                    raise HttpClientError(f"{method} {url} failed: {e}")
+                logging.warning(
+                    f"{method} {url} failed ({e}), retry {attempt + 1}/{retries}")
+            else:
+                if not self._should_retry(response.status_code, attempt, retries):
+                    return response
+                logging.warning(
+                    f"{method} {url} returned {response.status_code}, retry {attempt + 1}/{retries}")
+            await asyncio.sleep(self._delay(attempt))
+            attempt += 1
+
+    async def aget_json(self, url, **kwargs):
+        response = await self.arequest("GET", url, **kwargs)
+        if response.status_code >= 400:
+            raise HttpClientError(f"GET {url} returned HTTP {response.status_code}")
+        return response.json()
+
+    def close(self):
+        self._sync.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+# Function to return the process-wide shared client
+
+
+def get_http_client():
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(
+                max_connections_per_host=int(
+                    os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", "10")),
+                retries=int(os.environ.get("HTTP_RETRIES", "3")),
+                http2=os.environ.get("HTTP_CLIENT_HTTP2", "0") == "1")
+        return _default_client
@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Background conversion jobs: /convert submits a job and returns at once,
+# a separate worker pool runs the Selenium conversion, and clients poll
+# /jobs/<id> for status, per-leg progress and the final Betpawa code.
+# Every step also appends to the job's event log, which /jobs/<id>/events
+# streams to clients as Server-Sent Events. Submitting a code that is
+# already queued or running joins that job instead of starting another.
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+LEG_PENDING = "pending"
+LEG_RUNNING = "running"
+LEG_DONE = "done"
+LEG_FAILED = "failed"
+
+# Progress events emitted while a job runs
+EVENT_SPORTYBET_FETCHED = "sportybet_fetched"
+EVENT_LEG_RESOLVED = "leg_resolved"
+EVENT_LEG_FAILED = "leg_failed"
+EVENT_LEG_WARNING = "leg_warning"
+EVENT_BOOKING_READY = "booking_ready"
+EVENT_FAILED = "failed"
+
+
+# Function to multiply leg prices into accumulator odds, or None if there are no legs or any price is missing
+
+
+def combined_odds(prices):
+    total = None
+    for price in prices:
+        if price is None:
+            return None
+        total = price if total is None else total * price
+    return round(total, 2) if total is not None else None
+
+
+class Job:
+    def __init__(self, booking_code):
+        self.id = uuid.uuid4().hex
+        self.booking_code = booking_code
+        self.status = JOB_QUEUED
+        self.legs = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        # Number of /convert requests sharing this job
+        self.callers = 1
+        self.started_at = None
+        self.events = []
+        self._leg_started = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    # Function to append a progress event; callers must hold the lock
+
+    def _emit(self, event, **data):
+        self.events.append({'event': event, 'data': data})
+        self._changed.notify_all()
+
+    def _elapsed_ms(self, since):
+        if since is None:
+            return None
+        return int((time.time() - since) * 1000)
+
+    # Function to wait for events after the given position; returns the new
+    # events and whether the job has finished and every event was delivered
+
+    def wait_for_events(self, position, timeout=None):
+        with self._lock:
+            if position >= len(self.events) and self.status not in (JOB_DONE, JOB_FAILED):
+                self._changed.wait(timeout)
+            new_events = self.events[position:]
+            finished = self.status in (JOB_DONE, JOB_FAILED)
+            return new_events, finished
+
+    # Function to record the legs found on the Sportybet slip
+
+    def set_legs(self, matches):
+        with self._lock:
+            self.legs = [{
+                'home_team': match.home_team,
+                'away_team': match.away_team,
+                'market': match.market,
+                'selection': match.selection,
+                'status': LEG_PENDING,
+                'error': None,
+                'warning': None,
+                # Betpawa's price is read while the leg is selected; drift is betpawa - sportybet
+                'sportybet_price': match.price,
+                'betpawa_price': None,
+                'drift': None,
+            } for match in matches]
+            self.updated_at = time.time()
+            self._emit(EVENT_SPORTYBET_FETCHED, legs=len(self.legs),
+                       elapsed_ms=self._elapsed_ms(self.started_at))
+
+    def update_leg(self, index, status, error=None, betpawa_price=None):
+        with self._lock:
+            leg = self.legs[index]
+            leg['status'] = status
+            leg['error'] = str(error) if error else None
+            if betpawa_price is not None:
+                leg['betpawa_price'] = betpawa_price
+                if leg['sportybet_price'] is not None:
+                    leg['drift'] = round(betpawa_price - leg['sportybet_price'], 2)
+            self.updated_at = time.time()
+            if status == LEG_RUNNING:
+                self._leg_started[index] = self.updated_at
+            elif status in (LEG_DONE, LEG_FAILED):
+                event = EVENT_LEG_RESOLVED if status == LEG_DONE else EVENT_LEG_FAILED
+                self._emit(event, leg=index, home_team=leg['home_team'],
+                           away_team=leg['away_team'], error=leg['error'],
+                           betpawa_price=leg['betpawa_price'], drift=leg['drift'],
+                           elapsed_ms=self._elapsed_ms(self._leg_started.get(index)))
+
+    # Function to flag a leg that may still convert but is likely to fail
+
+    def warn_leg(self, index, warning):
+        with self._lock:
+            leg = self.legs[index]
+            leg['warning'] = warning
+            self.updated_at = time.time()
+            self._emit(EVENT_LEG_WARNING, leg=index, home_team=leg['home_team'],
+                       away_team=leg['away_team'], warning=warning)
+
+    def set_status(self, status, result=None, error=None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = str(error) if error else None
+            self.updated_at = time.time()
+            if status == JOB_RUNNING:
+                self.started_at = self.updated_at
+            elif status == JOB_DONE:
+                self._emit(EVENT_BOOKING_READY, converted_code=result,
+                           elapsed_ms=self._elapsed_ms(self.started_at))
+            elif status == JOB_FAILED:
+                self._emit(EVENT_FAILED, error=self.error,
+                           elapsed_ms=self._elapsed_ms(self.started_at))
+
+    # Function to return each leg's prices on both books and the combined odds of each slip
+
+    def price_report(self):
+        with self._lock:
+            return self._price_report()
+
+    def _price_report(self):
+        return {
+            'legs': [{key: leg[key] for key in ('home_team', 'away_team', 'market', 'selection',
+                                                'sportybet_price', 'betpawa_price', 'drift')}
+                     for leg in self.legs],
+            'combined_odds': self._combined_odds(),
+        }
+
+    def _combined_odds(self):
+        return {
+            'sportybet': combined_odds(leg['sportybet_price'] for leg in self.legs),
+            'betpawa': combined_odds(leg['betpawa_price'] for leg in self.legs),
+        }
+
+    def to_dict(self):
+        with self._lock:
+            legs = [dict(leg) for leg in self.legs]
+            return {
+                'job_id': self.id,
+                'booking_code': self.booking_code,
+                'status': self.status,
+                'progress': {
+                    'total': len(legs),
+                    'done': sum(1 for leg in legs if leg['status'] == LEG_DONE),
+                },
+                'legs': legs,
+                'combined_odds': self._combined_odds(),
+                'converted_code': self.result,
+                'error': self.error,
+                'callers': self.callers,
+                'created_at': self.created_at,
+                'updated_at': self.updated_at,
+            }
+
+
+class JobQueue:
+    def __init__(self, run_conversion, workers=2, retention=3600):
+        # run_conversion(job) performs the conversion, reports leg progress
+        # on the job and returns the Betpawa booking code
+        self.run_conversion = run_conversion
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="conversion")
+        self._jobs = {}
+        # Booking code -> its queued or running job, so repeat submissions share it
+        self._active = {}
+        self._lock = threading.Lock()
+
+    # Function to enqueue a conversion and return (job, joined) straight away; a
+    # code that is already queued or running returns that job with joined=True
+
+    def submit(self, booking_code):
+        with self._lock:
+            job = self._active.get(booking_code)
+            if job is not None:
+                job.callers += 1
+                logging.info(f"Joined conversion job {job.id} for {booking_code}")
+                return job, True
+            job = Job(booking_code)
+            self._purge_expired()
+            self._jobs[job.id] = job
+            self._active[booking_code] = job
+        self._executor.submit(self._run, job)
+        logging.info(f"Queued conversion job {job.id} for {booking_code}")
+        return job, False
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    # Number of jobs waiting for a free worker
+
+    def queue_depth(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == JOB_QUEUED)
+
+    def _run(self, job):
+        job.set_status(JOB_RUNNING)
+        try:
+            result = self.run_conversion(job)
+        except Exception as e:
+            logging.error(f"Conversion job {job.id} failed: {e}")
+            job.set_status(JOB_FAILED, error=e)
+        else:
+            job.set_status(JOB_DONE, result=result)
+        finally:
+            with self._lock:
+                if self._active.get(job.booking_code) is job:
+                    del self._active[job.booking_code]
+
+    # Function to drop finished jobs older than the retention window
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.status in (JOB_DONE, JOB_FAILED) and job.updated_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
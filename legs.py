@@ -0,0 +1,67 @@
+import sys
+
+# Compact leg model shared by the parser, the resolvers and the browser
+# flow. A Leg is a slotted object whose market type, line and selection
+# are interned strings, so the thousands of legs held by jobs, caches and
+# batch runs share one copy of each code and carry no per-instance dict.
+
+MARKET_1X2 = '1X2'
+MARKET_OVER_UNDER = 'Over/Under'
+MARKET_BTTS = 'BTTS'
+MARKET_DOUBLE_CHANCE = 'Double Chance'
+MARKET_DRAW_NO_BET = 'Draw No Bet'
+MARKET_1X2_1H = '1st Half 1X2'
+MARKET_OVER_UNDER_1H = '1st Half Over/Under'
+
+# (market type, line) -> display name, e.g. "Over/Under 2.5"; built once per pair
+_market_names = {}
+
+
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def market_name(market_type, line=None):
+    key = (market_type, line)
+    name = _market_names.get(key)
+    if name is None:
+        name = _market_names[key] = sys.intern(
+            f"{market_type} {line}" if line is not None else market_type)
+    return name
+
+
+class Leg:
+    __slots__ = ('event_id', 'home_team', 'away_team', 'start_time',
+                 'market_type', 'line', 'selection', 'side', 'odds')
+
+    def __init__(self, event_id, home_team, away_team, start_time, market_type,
+                 selection, line=None, odds=()):
+        self.event_id = intern(event_id)
+        self.home_team = intern(home_team)
+        self.away_team = intern(away_team)
+        self.start_time = start_time
+        self.market_type = intern(market_type)
+        self.line = intern(line)
+        self.selection = intern(selection)
+        # "Over"/"Under" for lined markets, the selection itself for every other market
+        self.side = intern(selection.partition(' ')[0]) \
+            if line is not None else self.selection
+        # (outcome name, decimal odds) for every outcome of the market
+        self.odds = tuple((intern(name), price) for name, price in odds)
+
+    @property
+    def market(self):
+        return market_name(self.market_type, self.line)
+
+    # Function to return the Sportybet odds of the picked outcome, or None
+
+    @property
+    def price(self):
+        for name, price in self.odds:
+            if name == self.selection:
+                return price
+        return None
+
+    def __repr__(self):
+        return (f"Leg({self.home_team} vs {self.away_team}, "
+                f"{self.market} {self.selection})")
@@ -0,0 +1,64 @@
+import time
+
+from betpawa_selectors import BET_PRICE_BUTTONS
+from readiness import record_step
+
+# Reads every market on a Betpawa event page in one execute_script call
+# instead of a WebDriver round trip per button. The snapshot carries each
+# market's title and its outcomes (label, price, text and element handle),
+# so selection runs in Python and only the final click goes back to the
+# browser.
+
+MARKET_CONTAINER_CSS = "div.events-container"
+MARKET_TITLE_CSS = "h4"
+OUTCOME_LABEL_CSS = ".event-selection"
+
+# Returns [{title, outcomes: [{label, text, price, element}]}] for every titled container
+MARKET_SNAPSHOT_JS = """
+const [containerCss, titleCss, buttonCss, labelCss] = arguments;
+const markets = [];
+const seen = new Set();
+for (const heading of document.querySelectorAll(containerCss + ' ' + titleCss)) {
+    const container = heading.closest(containerCss);
+    if (!container || seen.has(container)) {
+        continue;
+    }
+    seen.add(container);
+    const outcomes = [];
+    for (const button of container.querySelectorAll(buttonCss)) {
+        const text = (button.innerText || '').trim();
+        const lines = text.split('\\n').map(line => line.trim()).filter(Boolean);
+        const labelEl = button.querySelector(labelCss);
+        const price = parseFloat(lines.length ? lines[lines.length - 1] : '');
+        outcomes.push({
+            label: labelEl ? labelEl.innerText.trim() : (lines[0] || ''),
+            text: text,
+            price: Number.isFinite(price) ? price : null,
+            element: button,
+        });
+    }
+    markets.push({title: heading.innerText.trim(), outcomes: outcomes});
+}
+return markets;
+"""
+
+# Function to read every market and its outcomes from the current page in one round trip
+
+
+def snapshot_markets(driver):
+    start = time.perf_counter()
+    try:
+        return driver.execute_script(
+            MARKET_SNAPSHOT_JS, MARKET_CONTAINER_CSS, MARKET_TITLE_CSS,
+            BET_PRICE_BUTTONS.locator()[1], OUTCOME_LABEL_CSS) or []
+    finally:
+        record_step("market_snapshot", time.perf_counter() - start)
+
+# Function to return the first market whose title contains market_title, or None
+
+
+def find_market(markets, market_title):
+    for market in markets:
+        if market_title in market['title']:
+            return market
+    return None
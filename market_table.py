@@ -0,0 +1,137 @@
+import logging
+
+from legs import (MARKET_1X2, MARKET_1X2_1H, MARKET_BTTS, MARKET_DOUBLE_CHANCE,
+                  MARKET_DRAW_NO_BET, MARKET_OVER_UNDER, MARKET_OVER_UNDER_1H)
+
+# Translation table between Sportybet and Betpawa markets. One MarketRule
+# per market type says how Sportybet names it (desc, specifier key) and
+# how Betpawa shows it (event page title, API market type name, and the
+# label, button position and API price name of each outcome). The parser,
+# the API resolver and the browser flow all look rules up here by dict,
+# so supporting a new market is one table entry.
+
+
+class OutcomeRule:
+    __slots__ = ('label', 'index', 'price_name')
+
+    def __init__(self, label, index, price_name=None):
+        self.label = label  # Betpawa button label
+        self.index = index  # Position of the button within the market
+        self.price_name = price_name or label  # Betpawa API price name
+
+
+class MarketRule:
+    __slots__ = ('market_type', 'sportybet_desc', 'specifier_key', 'betpawa_title',
+                 'api_market_name', 'outcomes')
+
+    def __init__(self, market_type, sportybet_desc, betpawa_title, api_market_name,
+                 outcomes, specifier_key=None):
+        self.market_type = market_type
+        self.sportybet_desc = sportybet_desc
+        # Markets with a line (totals) read it from this specifier key, e.g. total=2.5
+        self.specifier_key = specifier_key
+        self.betpawa_title = betpawa_title
+        self.api_market_name = api_market_name
+        # Sportybet outcome desc (or side, for lined markets) -> OutcomeRule
+        self.outcomes = outcomes
+
+    @property
+    def lined(self):
+        return self.specifier_key is not None
+
+    # Function to read the line from a Sportybet specifier such as "total=2.5"
+
+    def parse_line(self, specifier, default):
+        for part in (specifier or '').split('|'):
+            key, _, value = part.partition('=')
+            if key == self.specifier_key and value:
+                return value
+        return default
+
+    def outcome(self, leg):
+        return self.outcomes.get(leg.side if self.lined else leg.selection)
+
+    # Function to return the label shown on the leg's button, e.g. "Over (2.5)"
+
+    def button_label(self, leg):
+        outcome = self.outcome(leg)
+        if outcome is None:
+            return None
+        return f"{outcome.label} ({leg.line})" if self.lined else outcome.label
+
+
+def _totals(market_type, sportybet_desc, betpawa_title, api_market_name):
+    return MarketRule(market_type, sportybet_desc, betpawa_title, api_market_name, {
+        "Over": OutcomeRule("Over", 0),
+        "Under": OutcomeRule("Under", 1),
+    }, specifier_key='total')
+
+
+MARKET_RULES = [
+    MarketRule(MARKET_1X2, '1X2', "1X2 | Full Time", "1X2 - FT", {
+        "Home": OutcomeRule("1", 0),
+        "Draw": OutcomeRule("X", 1),
+        "Away": OutcomeRule("2", 2),
+    }),
+    _totals(MARKET_OVER_UNDER, 'Over/Under',
+            "Over/Under | Full Time", "Over/Under - FT"),
+    MarketRule(MARKET_BTTS, 'GG/NG', "Both Teams To Score | Full Time", "Both Teams To Score - FT", {
+        "Yes": OutcomeRule("Yes", 0),
+        "No": OutcomeRule("No", 1),
+    }),
+    MarketRule(MARKET_DOUBLE_CHANCE, 'Double Chance', "Double Chance | Full Time", "Double Chance - FT", {
+        "Home or Draw": OutcomeRule("1X", 0),
+        "Home or Away": OutcomeRule("12", 1),
+        "Draw or Away": OutcomeRule("X2", 2),
+    }),
+    MarketRule(MARKET_DRAW_NO_BET, 'Draw No Bet', "Draw No Bet | Full Time", "Draw No Bet - FT", {
+        "Home": OutcomeRule("1", 0),
+        "Away": OutcomeRule("2", 1),
+    }),
+    MarketRule(MARKET_1X2_1H, '1st Half - 1X2', "1X2 | 1st Half", "1X2 - 1H", {
+        "Home": OutcomeRule("1", 0),
+        "Draw": OutcomeRule("X", 1),
+        "Away": OutcomeRule("2", 2),
+    }),
+    _totals(MARKET_OVER_UNDER_1H, '1st Half - Over/Under',
+            "Over/Under | 1st Half", "Over/Under - 1H"),
+]
+
+RULES_BY_SPORTYBET_DESC = {rule.sportybet_desc: rule for rule in MARKET_RULES}
+RULES_BY_MARKET_TYPE = {rule.market_type: rule for rule in MARKET_RULES}
+
+# Function to tell whether the table can translate a leg's market and selection
+
+
+def supports(leg):
+    rule = RULES_BY_MARKET_TYPE.get(leg.market_type)
+    return rule is not None and rule.outcome(leg) is not None
+
+# Function to pick the index of the leg's button among snapshot outcomes, raising ValueError if absent
+
+
+def select_button(rule, leg, buttons):
+    outcome = rule.outcome(leg)
+    if outcome is None:
+        raise ValueError(
+            f"Unsupported selection {leg.selection} for {rule.market_type}")
+    if not rule.lined:
+        # Match the button's own label; the position is only a fallback for
+        # buttons whose label doesn't read as expected
+        expected_label = outcome.label.lower()
+        for index, button in enumerate(buttons):
+            if (button.get('label') or '').strip().lower() == expected_label:
+                return index
+        if len(buttons) <= outcome.index:
+            raise ValueError(
+                f"Expected at least {outcome.index + 1} betting buttons for {rule.market_type}, but found {len(buttons)}")
+        logging.warning(
+            f"No {outcome.label} button in {rule.market_type} (labels: {[button.get('label') for button in buttons]}), using position {outcome.index}")
+        return outcome.index
+    # Lined markets list every line, so find the button by its label
+    expected_label = rule.button_label(leg).lower()
+    for index, button in enumerate(buttons):
+        if expected_label in button['text'].lower():
+            return index
+    raise ValueError(
+        f"Could not find betting button for {rule.button_label(leg)} in {rule.market_type}")
@@ -0,0 +1,51 @@
+# Hash join between Sportybet and Betpawa events. One side is indexed by
+# lowercased team names and kickoff bucket, so matching whole feeds runs in
+# O(n + m) instead of comparing every pair. Events without a kickoff time
+# can't be placed in a bucket, so they are reported as unmatched.
+
+# Allowed difference between kickoff times, in milliseconds
+START_TIME_TOLERANCE_MS = 60000
+
+
+def match_key(match, bucket_size):
+    return (match['home_team'].lower(), match['away_team'].lower(),
+            match['start_time'] // bucket_size)
+
+# Function to join two event lists, returning matched pairs and the events left over on each side
+
+
+def join_matches(sportybet_matches, betpawa_matches, tolerance=START_TIME_TOLERANCE_MS):
+    # Buckets are as wide as the tolerance, so any partner within tolerance
+    # sits in the same bucket or one of its two neighbours
+    index = {}
+    for position, bp_match in enumerate(betpawa_matches):
+        if bp_match['start_time'] is None:
+            continue
+        index.setdefault(match_key(bp_match, tolerance),
+                         []).append(position)
+
+    pairs = []
+    matched_betpawa = set()
+    unmatched_sportybet = []
+    for sb_match in sportybet_matches:
+        if sb_match['start_time'] is None:
+            unmatched_sportybet.append(sb_match)
+            continue
+        home, away, bucket = match_key(sb_match, tolerance)
+        candidates = []
+        for probe in (bucket - 1, bucket, bucket + 1):
+            candidates.extend(index.get((home, away, probe), ()))
+        found = False
+        # Keep Betpawa events in feed order, as the nested loop did
+        for position in sorted(candidates):
+            bp_match = betpawa_matches[position]
+            if abs(sb_match['start_time'] - bp_match['start_time']) < tolerance:
+                pairs.append((sb_match, bp_match))
+                matched_betpawa.add(position)
+                found = True
+        if not found:
+            unmatched_sportybet.append(sb_match)
+
+    unmatched_betpawa = [bp_match for position, bp_match in enumerate(betpawa_matches)
+                         if position not in matched_betpawa]
+    return pairs, unmatched_sportybet, unmatched_betpawa
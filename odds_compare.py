@@ -0,0 +1,146 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python loop below is used instead
+    np = None
+
+# Cross-book 1X2 odds comparison over whole catalogs. Both books' prices
+# are aligned into (events x outcomes) arrays and implied probabilities,
+# overrounds, price differences and the best price per outcome are
+# computed in single vectorized passes with NumPy. Without NumPy the same
+# numbers come from a plain loop, so callers get identical reports either
+# way, just slower.
+
+OUTCOME_NAMES = ("1", "X", "2")
+BOOKS = ("sportybet", "betpawa")
+# Outcome names either feed may use -> position in OUTCOME_NAMES
+OUTCOME_INDEX = {"1": 0, "X": 1, "2": 2, "Home": 0, "Draw": 1, "Away": 2}
+
+
+class OddsComparison:
+    __slots__ = ('keys', 'prices', 'implied', 'overround', 'difference',
+                 'best_book', 'best_price', 'best_overround')
+
+    def __init__(self, keys, prices, implied, overround, difference,
+                 best_book, best_price, best_overround):
+        self.keys = keys
+        self.prices = prices  # per book: events x outcomes
+        self.implied = implied  # per book: 1 / price
+        self.overround = overround  # per book: sum(implied) - 1 per event
+        self.difference = difference  # betpawa price - sportybet price
+        self.best_book = best_book  # index into BOOKS per event and outcome
+        self.best_price = best_price
+        # Margin of a slip built from the best price of each outcome; < 0 means an arbitrage
+        self.best_overround = best_overround
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _price_row(outcomes):
+    row = [math.nan] * len(OUTCOME_NAMES)
+    for name, price in outcomes:
+        index = OUTCOME_INDEX.get(name)
+        if index is not None:
+            row[index] = float(price)
+    return tuple(row)
+
+# Function to read {event id: (1, X, 2)} from a Sportybet 1X2 feed, looking outcomes up by id rather than position
+
+
+def sportybet_prices(data):
+    return {item["eventId"]: _price_row((selection["id"], selection["price"])
+                                        for selection in item["selections"])
+            for item in data["items"]}
+
+# Function to read {event id: (1, X, 2)} from a Betpawa 1X2 feed
+
+
+def betpawa_prices(data):
+    return {item["event"]["id"]: _price_row((price["name"], price["price"])
+                                            for price in item["market"]["price"])
+            for item in data["items"]}
+
+# Function to keep the events both books price, in a stable order
+
+
+def align_prices(sportybet_prices, betpawa_prices):
+    keys = [key for key in sportybet_prices if key in betpawa_prices]
+    return (keys, [sportybet_prices[key] for key in keys],
+            [betpawa_prices[key] for key in keys])
+
+
+def _implied(price):
+    return 1.0 / price if price > 1.0 else math.nan
+
+
+def _compare_numpy(keys, sportybet, betpawa):
+    prices = np.stack([np.asarray(sportybet, dtype=np.float64).reshape(-1, len(OUTCOME_NAMES)),
+                       np.asarray(betpawa, dtype=np.float64).reshape(-1, len(OUTCOME_NAMES))])
+    # Prices of 1.0 or less (or missing) carry no probability
+    with np.errstate(divide='ignore', invalid='ignore'):
+        implied = np.where(prices > 1.0, 1.0 / prices, np.nan)
+    overround = implied.sum(axis=2) - 1.0
+    difference = prices[1] - prices[0]
+    best_book = np.argmax(np.nan_to_num(prices, nan=-np.inf), axis=0)
+    best_price = np.take_along_axis(prices, best_book[np.newaxis], axis=0)[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        best_overround = np.where(best_price > 1.0, 1.0 / best_price, np.nan).sum(axis=1) - 1.0
+    return OddsComparison(keys, prices, implied, overround, difference,
+                          best_book, best_price, best_overround)
+
+
+def _compare_python(keys, sportybet, betpawa):
+    prices = (list(sportybet), list(betpawa))
+    implied = tuple([tuple(_implied(p) for p in row) for row in book] for book in prices)
+    overround = tuple([sum(row) - 1.0 for row in book] for book in implied)
+    difference = [tuple(b - s for s, b in zip(sb_row, bp_row))
+                  for sb_row, bp_row in zip(*prices)]
+    best_book, best_price, best_overround = [], [], []
+    for sb_row, bp_row in zip(*prices):
+        # Ties go to Sportybet, as with argmax
+        books = tuple(1 if bp > sb or (math.isnan(sb) and not math.isnan(bp)) else 0
+                      for sb, bp in zip(sb_row, bp_row))
+        best = tuple((sb_row, bp_row)[book][i] for i, book in enumerate(books))
+        best_book.append(books)
+        best_price.append(best)
+        best_overround.append(sum(_implied(p) for p in best) - 1.0)
+    return OddsComparison(keys, prices, implied, overround, difference,
+                          best_book, best_price, best_overround)
+
+# Function to compare aligned (events x 3) price rows from both books
+
+
+def compare_odds(keys, sportybet, betpawa, vectorized=True):
+    if vectorized and np is not None:
+        return _compare_numpy(keys, sportybet, betpawa)
+    return _compare_python(keys, sportybet, betpawa)
+
+# Function to rank events by the margin of their best-price slip, arbitrages first
+
+
+def ranked_report(comparison, limit=50):
+    count = len(comparison)
+    if np is not None and isinstance(comparison.best_overround, np.ndarray):
+        margins = np.where(np.isnan(comparison.best_overround),
+                           np.inf, comparison.best_overround)
+        order = np.argsort(margins, kind='stable')[:limit].tolist()
+    else:
+        order = sorted(range(count), key=lambda i: (
+            math.isnan(comparison.best_overround[i]), comparison.best_overround[i]))[:limit]
+
+    report = []
+    for i in order:
+        report.append({
+            'event': comparison.keys[i],
+            'best_overround': float(comparison.best_overround[i]),
+            'overround': {book: float(comparison.overround[b][i]) for b, book in enumerate(BOOKS)},
+            'outcomes': {name: {
+                'sportybet': float(comparison.prices[0][i][o]),
+                'betpawa': float(comparison.prices[1][i][o]),
+                'difference': float(comparison.difference[i][o]),
+                'best': BOOKS[int(comparison.best_book[i][o])],
+            } for o, name in enumerate(OUTCOME_NAMES)},
+        })
+    return report
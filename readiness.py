@@ -0,0 +1,226 @@
+import logging
+import threading
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Event-driven page readiness. Instead of WebDriverWait's 0.5 s polling, a
+# wait injects a MutationObserver into the page and returns the moment the
+# target element appears, and network idle is tracked by an in-flight
+# request counter installed through the DevTools protocol. Every wait
+# records its latency per step so the savings can be measured.
+
+# Resolves with [element, locator index] as soon as one of the locators,
+# tried in order, matches (and is clickable, when asked)
+WAIT_FOR_ELEMENT_JS = """
+const [locators, clickable, timeoutMs, done] = arguments;
+function findOne(by, value) {
+    let el = null;
+    if (by === 'css selector') {
+        el = document.querySelector(value);
+    } else if (by === 'xpath') {
+        el = document.evaluate(value, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else if (by === 'id') {
+        el = document.getElementById(value);
+    }
+    if (el && clickable) {
+        const rect = el.getBoundingClientRect();
+        if (!(rect.width || rect.height) || el.disabled) {
+            return null;
+        }
+    }
+    return el;
+}
+function find() {
+    for (let i = 0; i < locators.length; i++) {
+        const el = findOne(locators[i][0], locators[i][1]);
+        if (el) {
+            return [el, i];
+        }
+    }
+    return null;
+}
+const found = find();
+if (found) {
+    done(found);
+    return;
+}
+const observer = new MutationObserver(() => {
+    const result = find();
+    if (result) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(result);
+    }
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+const timer = setTimeout(() => {
+    observer.disconnect();
+    done(null);
+}, timeoutMs);
+"""
+
+# Installed on every new document: counts fetch/XHR requests still in flight
+NETWORK_TRACKER_JS = """
+(() => {
+    window.__inflightRequests = 0;
+    window.__lastNetworkActivity = performance.now();
+    const start = () => { window.__inflightRequests++; window.__lastNetworkActivity = performance.now(); };
+    const end = () => { window.__inflightRequests--; window.__lastNetworkActivity = performance.now(); };
+    const originalFetch = window.fetch;
+    window.fetch = function () {
+        start();
+        return originalFetch.apply(this, arguments).finally(end);
+    };
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        start();
+        this.addEventListener('loadend', end, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# Resolves once no fetch/XHR has been in flight for idleMs
+WAIT_FOR_NETWORK_IDLE_JS = """
+const [idleMs, timeoutMs, done] = arguments;
+const started = performance.now();
+function check() {
+    const idleFor = performance.now() - (window.__lastNetworkActivity || 0);
+    if ((window.__inflightRequests || 0) <= 0 && idleFor >= idleMs) {
+        done(true);
+    } else if (performance.now() - started >= timeoutMs) {
+        done(false);
+    } else {
+        setTimeout(check, Math.max(10, idleMs - idleFor));
+    }
+}
+check();
+"""
+
+# Poll interval when falling back to WebDriverWait
+FALLBACK_POLL_FREQUENCY = 0.05
+
+_step_latency = {}
+_step_latency_lock = threading.Lock()
+
+
+def record_step(step, seconds):
+    with _step_latency_lock:
+        stats = _step_latency.setdefault(
+            step, {'count': 0, 'total': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['total'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+
+# Function to return count, mean and max wait time per step, in milliseconds
+
+
+def get_step_latency():
+    with _step_latency_lock:
+        return {step: {
+            'count': stats['count'],
+            'mean_ms': stats['total'] / stats['count'] * 1000,
+            'max_ms': stats['max'] * 1000,
+        } for step, stats in _step_latency.items()}
+
+
+# Conditions understood by EventWait; the first two mirror the EC functions
+# of the same name, any_of_located takes ordered fallback locators
+
+
+class any_of_located:
+    def __init__(self, locators, clickable=False):
+        self.locators = list(locators)
+        self.clickable = clickable
+        self.matched_index = None
+
+    def __call__(self, driver):
+        for index, locator in enumerate(self.locators):
+            elements = driver.find_elements(*locator)
+            if not elements:
+                continue
+            element = elements[0]
+            if self.clickable and not (element.is_displayed() and element.is_enabled()):
+                continue
+            self.matched_index = index
+            return element
+        return False
+
+
+class presence_of_element_located(any_of_located):
+    def __init__(self, locator):
+        super().__init__([locator])
+
+
+class element_to_be_clickable(any_of_located):
+    def __init__(self, locator):
+        super().__init__([locator], clickable=True)
+
+
+# Function to install the network tracker on every page the driver loads
+
+
+def install_network_tracker(driver):
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                           "source": NETWORK_TRACKER_JS})
+
+
+class EventWait:
+    # Drop-in for WebDriverWait(driver, timeout).until(EC.*) that resolves on DOM mutations
+
+    def __init__(self, driver, timeout, step=None):
+        self.driver = driver
+        self.timeout = timeout
+        self.step = step
+
+    def until(self, condition):
+        start = time.perf_counter()
+        try:
+            return self._until(condition)
+        finally:
+            if self.step:
+                record_step(self.step, time.perf_counter() - start)
+
+    def _until(self, condition):
+        start = time.perf_counter()
+        if isinstance(condition, any_of_located) and all(
+                by in (By.CSS_SELECTOR, By.XPATH, By.ID) for by, _ in condition.locators):
+            locators = [list(locator) for locator in condition.locators]
+            try:
+                self.driver.set_script_timeout(self.timeout + 1)
+                result = self.driver.execute_async_script(
+                    WAIT_FOR_ELEMENT_JS, locators, condition.clickable, int(self.timeout * 1000))
+            except (JavascriptException, WebDriverException) as e:
+                # The page navigated away mid-wait; finish the wait by polling
+                logging.debug(
+                    f"Event wait for {condition.locators[0][1]} interrupted: {e}")
+            else:
+                if result is None:
+                    raise TimeoutException(
+                        f"Timed out after {self.timeout}s waiting for {condition.locators[0][1]}")
+                element, condition.matched_index = result
+                return element
+
+        remaining = max(0.0, self.timeout - (time.perf_counter() - start))
+        return WebDriverWait(self.driver, remaining,
+                             poll_frequency=FALLBACK_POLL_FREQUENCY).until(condition)
+
+    # Function to wait until no fetch/XHR has been in flight for idle_ms
+
+    def until_network_idle(self, idle_ms=300):
+        start = time.perf_counter()
+        try:
+            self.driver.set_script_timeout(self.timeout + 1)
+            idle = self.driver.execute_async_script(
+                WAIT_FOR_NETWORK_IDLE_JS, idle_ms, int(self.timeout * 1000))
+        finally:
+            if self.step:
+                record_step(self.step, time.perf_counter() - start)
+        if not idle:
+            raise TimeoutException(
+                f"Network not idle after {self.timeout}s")
+        return True
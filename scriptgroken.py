@@ -8,6 +8,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 
+from betpawa_selectors import (BETSLIP_FILLED, BET_PRICE_BUTTON_BY_LABEL,
+                               EVENT_CONTAINER, SEARCH_ICON, SEARCH_INPUT)
+from http_client import get_http_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO,
                     format="%(asctime)s - %(levelname)s - %(message)s")
@@ -32,9 +36,8 @@ def get_sportybet_matches(booking_code):
     url = SPORTYBET_API_URL.format(
         booking_code=booking_code, timestamp=int(datetime.now().timestamp() * 1000))
     try:
-        response = requests.get(url, headers=SPORTYBET_HEADERS, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = get_http_client().get_json(
+            url, headers=SPORTYBET_HEADERS, timeout=10)
     except (requests.exceptions.RequestException, ValueError) as e:
         logging.error(f"Failed to fetch Sportybet matches: {e}")
         return []
@@ -81,14 +84,14 @@ def search_and_select_bet(driver, match):
         # Step 1: Click the search icon
         search_icon = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "svg[data-test-id='headerIconSearch']"))
+                SEARCH_ICON.locator())
         )
         search_icon.click()
 
         # Step 2: Enter the team names in the search bar
         search_bar = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "input[type='text']"))
+                SEARCH_INPUT.locator())
         )
         search_bar.clear()
         search_bar.send_keys(f"{home_team} vs {away_team}")
@@ -97,8 +100,7 @@ def search_and_select_bet(driver, match):
         # Step 3: Wait for the match to appear
         match_container = WebDriverWait(driver, 20).until(
             EC.presence_of_element_located(
-                (By.XPATH,
-                 f"//div[contains(@class, 'events-container')]//div[contains(@class, 'teams') and .//p[contains(text(), '{home_team}')] and .//p[contains(text(), '{away_team}')]]//ancestor::div[contains(@class, 'events-container')]")
+                EVENT_CONTAINER.locator(home_team=home_team, away_team=away_team)
             )
         )
 
@@ -115,14 +117,14 @@ def search_and_select_bet(driver, match):
 
         # Refined XPath to find the clickable betting button
         bet_button = match_container.find_element(
-            By.XPATH, f".//span[contains(@class, 'event-bet-wrapper') and contains(@class, 'bet-price') and .//span[contains(@class, 'event-selection') and text()='{bet_option}']]"
+            *BET_PRICE_BUTTON_BY_LABEL.locator(label=bet_option)
         )
         bet_button.click()
 
         # Step 6: Verify the bet was added to the bet slip
         WebDriverWait(driver, 5).until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div.betslip-main:not(.empty-betslip)"))
+                BETSLIP_FILLED.locator())
         )
         logging.info(
             f"Added {selection} ({bet_option}) for {home_team} vs {away_team} to bet slip")
@@ -1,5 +1,8 @@
 import json
 
+from odds_compare import (align_prices, betpawa_prices, compare_odds,
+                          ranked_report, sportybet_prices)
+
 # Sample JSON responses (replace with actual API responses)
 sportybet_response = {
     "items": [
@@ -67,31 +70,26 @@ betpawa_response = {
 
 
 def map_bets(sportybet_data, betpawa_data):
+    sportybet = sportybet_prices(sportybet_data)
+    betpawa = betpawa_prices(betpawa_data)
     mapped_matches = {}
 
-    # Process SportyBet data
+    # Process SportyBet data; outcomes are read by id, not list position
     for match in sportybet_data["items"]:
         event_id = match["eventId"]
+        home_win, draw, away_win = sportybet[event_id]
         mapped_matches[event_id] = {
             "match": match["event"],
             "startTime": match["startTime"],
-            "sportybet": {
-                "home_win": match["selections"][0]["price"],
-                "draw": match["selections"][1]["price"],
-                "away_win": match["selections"][2]["price"]
-            },
+            "sportybet": {"home_win": home_win, "draw": draw, "away_win": away_win},
             "betpawa": {}
         }
 
-    # Process BetPawa data and merge
-    for match in betpawa_data["items"]:
-        event_id = match["event"]["id"]
+    # Merge BetPawa prices
+    for event_id, (home_win, draw, away_win) in betpawa.items():
         if event_id in mapped_matches:
             mapped_matches[event_id]["betpawa"] = {
-                "home_win": match["market"]["price"][0]["price"],
-                "draw": match["market"]["price"][1]["price"],
-                "away_win": match["market"]["price"][2]["price"]
-            }
+                "home_win": home_win, "draw": draw, "away_win": away_win}
 
     return mapped_matches
 
@@ -101,3 +99,8 @@ mapped_data = map_bets(sportybet_response, betpawa_response)
 
 # Pretty print the result
 print(json.dumps(mapped_data, indent=4))
+
+# Rank events by the margin of their best-price slip
+comparison = compare_odds(*align_prices(sportybet_prices(sportybet_response),
+                                        betpawa_prices(betpawa_response)))
+print(json.dumps(ranked_report(comparison), indent=4))
@@ -8,6 +8,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 
+from betpawa_selectors import SEARCH_ICON, SEARCH_INPUT
+from http_client import get_http_client
+
 # Configure logging
 logging.basicConfig(level=logging.INFO,
                     format="%(asctime)s - %(levelname)s - %(message)s")
@@ -32,9 +35,8 @@ def get_sportybet_matches(booking_code):
     url = SPORTYBET_API_URL.format(
         booking_code=booking_code, timestamp=int(datetime.now().timestamp() * 1000))
     try:
-        response = requests.get(url, headers=SPORTYBET_HEADERS, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = get_http_client().get_json(
+            url, headers=SPORTYBET_HEADERS, timeout=10)
     except (requests.exceptions.RequestException, ValueError) as e:
         logging.error(f"Failed to fetch Sportybet matches: {e}")
         return []
@@ -78,14 +80,14 @@ def search_and_select_bet(driver, team_name, sportybet_selection):
         # Click the search icon (use the parent <svg> element)
         search_icon = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "svg[data-test-id='headerIconSearch']"))
+                SEARCH_ICON.locator())
         )
         search_icon.click()
 
         # Enter the team name in the search bar
         search_bar = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "input[type='text']"))
+                SEARCH_INPUT.locator())
         )
         search_bar.clear()
         search_bar.send_keys(team_name)
@@ -1,6 +1,9 @@
 import requests
 from datetime import datetime
 
+from http_client import get_http_client
+from match_join import join_matches
+
 # Function to fetch and parse Sportybet matches
 
 
@@ -13,16 +16,10 @@ def get_sportybet_matches(booking_code):
         "Referer": "https://www.sportybet.com/",
         "Origin": "https://www.sportybet.com",
     }
-    response = requests.get(url, headers=headers)
-
-    # # Debugging: Print the status code and raw response
-    # print(f"Status Code: {response.status_code}")
-    # print(f"Response Text: {response.text}")
-
     try:
-        data = response.json()
-    except requests.exceptions.JSONDecodeError as e:
-        print(f"Failed to decode JSON: {e}")
+        data = get_http_client().get_json(url, headers=headers)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Failed to fetch Sportybet matches: {e}")
         return []
 
     matches = []
@@ -55,16 +52,10 @@ def get_betpawa_matches(booking_code):
         "x-pawa-language": "en",
     }
 
-    response = requests.get(url, headers=headers)
-
-    # # Debugging: Print response status and content
-    # print(f"Status Code: {response.status_code}")
-    # print(f"Response Text: {response.text}")
-
     try:
-        data = response.json()
-    except requests.exceptions.JSONDecodeError as e:
-        print(f"Failed to decode JSON: {e}")
+        data = get_http_client().get_json(url, headers=headers)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Failed to fetch Betpawa matches: {e}")
         return []
 
     matches = []
@@ -96,15 +87,8 @@ def get_betpawa_matches(booking_code):
 
 
 def find_equivalent_matches(sportybet_matches, betpawa_matches):
-    equivalent_matches = []
-    for sb_match in sportybet_matches:
-        for bp_match in betpawa_matches:
-            # Match based on team names and start time
-            if (sb_match['home_team'].lower() == bp_match['home_team'].lower() and
-                sb_match['away_team'].lower() == bp_match['away_team'].lower() and
-                    # Allow 1-minute difference
-                    abs(sb_match['start_time'] - bp_match['start_time']) < 60000):
-                equivalent_matches.append((sb_match, bp_match))
+    # Match based on team names and start time (1-minute tolerance)
+    equivalent_matches, _, _ = join_matches(sportybet_matches, betpawa_matches)
     return equivalent_matches
 
 
@@ -118,7 +102,7 @@ if __name__ == "__main__":
     betpawa_matches = get_betpawa_matches(betpawa_code)
 
     # Find equivalent matches
-    equivalent_matches = find_equivalent_matches(
+    equivalent_matches, unmatched_sportybet, unmatched_betpawa = join_matches(
         sportybet_matches, betpawa_matches)
 
     # Display results
@@ -128,3 +112,11 @@ if __name__ == "__main__":
             f"Sportybet Odds - Home: {sb_match['odds'].get('Home', 'N/A')}, Draw: {sb_match['odds'].get('Draw', 'N/A')}, Away: {sb_match['odds'].get('Away', 'N/A')}")
         print(f"Betpawa Odds - Home: {bp_match['odds']['Home']}")
         print("------")
+
+    # Report events found on only one side
+    for sb_match in unmatched_sportybet:
+        print(
+            f"Only on Sportybet: {sb_match['home_team']} vs {sb_match['away_team']}")
+    for bp_match in unmatched_betpawa:
+        print(
+            f"Only on Betpawa: {bp_match['home_team']} vs {bp_match['away_team']}")
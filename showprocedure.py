@@ -1,7 +1,6 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -10,6 +9,11 @@ import time
 import requests
 from datetime import datetime
 
+from betpawa_selectors import (BETSLIP_FILLED, BET_PRICE_BUTTONS,
+                               BOOKING_CODE_LINK, BOOKING_CODE_POPUP,
+                               EVENT_CONTAINER, SEARCH_ICON, SEARCH_INPUT)
+from http_client import get_http_client
+
 app = Flask(__name__)
 CORS(app)
 
@@ -37,9 +41,8 @@ def get_sportybet_matches(booking_code):
     url = SPORTYBET_API_URL.format(
         booking_code=booking_code, timestamp=int(datetime.now().timestamp() * 1000))
     try:
-        response = requests.get(url, headers=SPORTYBET_HEADERS, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = get_http_client().get_json(
+            url, headers=SPORTYBET_HEADERS, timeout=10)
     except (requests.exceptions.RequestException, ValueError) as e:
         logging.error(f"Failed to fetch Sportybet matches: {e}")
         return []
@@ -86,14 +89,14 @@ def search_and_select_bet(driver, match):
         # Step 1: Click the search icon
         search_icon = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "svg[data-test-id='headerIconSearch']"))
+                SEARCH_ICON.locator())
         )
         search_icon.click()
 
         # Step 2: Enter the team names in the search bar
         search_bar = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "input[type='text']"))
+                SEARCH_INPUT.locator())
         )
         search_bar.clear()
         search_bar.send_keys(f"{home_team} vs {away_team}")
@@ -102,16 +105,14 @@ def search_and_select_bet(driver, match):
         # Step 3: Wait for the match to appear
         match_container = WebDriverWait(driver, 20).until(
             EC.presence_of_element_located(
-                (By.XPATH,
-                 f"//div[contains(@class, 'events-container prematch')]//div[contains(@class, 'teams') and .//p[contains(text(), '{home_team}')] and .//p[contains(text(), '{away_team}')]]//ancestor::div[contains(@class, 'events-container prematch')]")
+                EVENT_CONTAINER.locator(home_team=home_team, away_team=away_team)
             )
         )
 
         # Step 4: Wait for betting options to load and get the first three spans
         betting_buttons = WebDriverWait(driver, 10).until(
             EC.presence_of_all_elements_located(
-                (By.XPATH,
-                 ".//span[contains(@class, 'event-bet-wrapper') and contains(@class, 'bet-price')]")
+                BET_PRICE_BUTTONS.locator()
             )
         )
 
@@ -135,7 +136,7 @@ def search_and_select_bet(driver, match):
         # Step 6: Verify the bet was added to the bet slip
         WebDriverWait(driver, 5).until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div.betslip-main:not(.empty-betslip)"))
+                BETSLIP_FILLED.locator())
         )
         logging.info(
             f"Added {selection} ({bet_option}) for {home_team} vs {away_team} to bet slip")
@@ -157,7 +158,7 @@ def generate_booking_code(driver):
         # Step 1: Locate and click the "Booking code" link
         booking_code_link = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable(
-                (By.XPATH, "//a[contains(@class, 'underline') and contains(@class, 'booking-code-link') and .//span[contains(text(), 'Booking code')]]")
+                BOOKING_CODE_LINK.locator()
             )
         )
         booking_code_link.click()
@@ -165,7 +166,7 @@ def generate_booking_code(driver):
         # Step 2: Wait for the popup to appear and extract the booking code from the h2 element
         booking_code = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located(
-                (By.XPATH, "//h2")
+                BOOKING_CODE_POPUP.locator()
             )
         ).text
 
@@ -0,0 +1,220 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Single-flight execution keyed by Sportybet booking code: while one
+# conversion for a code is running, every other caller for that code waits
+# for it and gets its result instead of starting its own browser. Callers in
+# the same process wait on an in-memory flight. With a shared lock store,
+# workers in other processes do the same: the first to take the store's lock
+# runs the conversion and publishes the outcome, the rest poll for it.
+#
+# Each flight has its own owner id. A finished flight frees the key at once,
+# so a later caller starts a new flight; only callers that were already
+# waiting on that owner read its published outcome.
+#
+# A lock store provides:
+#   acquire(key, owner, ttl) -> True if owner now holds the lock for key
+#   renew(key, owner, ttl) -> extend owner's lock; False once it was lost
+#   publish(key, owner, result, error) -> record the outcome and end the flight
+#   fetch(key) -> None when no flight is running or recently finished, else
+#                 (owner, finished, result, error)
+
+
+class SingleFlightError(Exception):
+    pass
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SqliteLockStore:
+    def __init__(self, path, result_ttl=30):
+        self.path = path
+        # Finished outcomes stay readable this long, for callers that were waiting on them
+        self.result_ttl = result_ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            # Autocommit, so BEGIN IMMEDIATE below takes the write lock explicitly
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS flights ("
+                "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "finished INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT)")
+        return self._conn
+
+    def _live(self, expires_at, now):
+        return expires_at > now
+
+    def acquire(self, key, owner, ttl):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT expires_at, finished FROM flights WHERE key = ?", (key,)).fetchone()
+                # A finished flight no longer holds the key
+                if row is not None and not row[1] and self._live(row[0], now):
+                    conn.execute("COMMIT")
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO flights (key, owner, expires_at, finished) "
+                    "VALUES (?, ?, ?, 0)", (key, owner, now + ttl))
+                conn.execute("COMMIT")
+                return True
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+    def renew(self, key, owner, ttl):
+        with self._lock:
+            try:
+                cursor = self._connection().execute(
+                    "UPDATE flights SET expires_at = ? WHERE key = ? AND owner = ? AND finished = 0",
+                    (time.time() + ttl, key, owner))
+            except sqlite3.Error as e:
+                # Keep the lease; the next heartbeat tries again
+                logging.error(f"Failed to renew the conversion lock of {key}: {e}")
+                return True
+            return cursor.rowcount > 0
+
+    def publish(self, key, owner, result=None, error=None):
+        with self._lock:
+            try:
+                cursor = self._connection().execute(
+                    "UPDATE flights SET finished = 1, result = ?, error = ?, expires_at = ? "
+                    "WHERE key = ? AND owner = ?",
+                    (json.dumps(result), error, time.time() + self.result_ttl, key, owner))
+            except sqlite3.Error as e:
+                # Waiting workers time out or take over once the lock expires
+                logging.error(f"Failed to publish the conversion of {key}: {e}")
+                return
+            if cursor.rowcount == 0:
+                logging.warning(
+                    f"Conversion lock of {key} was taken over before its result was published")
+
+    def fetch(self, key):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT expires_at, owner, finished, result, error FROM flights WHERE key = ?",
+                (key,)).fetchone()
+        if row is None or not self._live(row[0], time.time()):
+            return None
+        _, owner, finished, result, error = row
+        return owner, bool(finished), json.loads(result) if result else None, error
+
+
+class SingleFlight:
+    def __init__(self, store=None, lock_ttl=300, wait_timeout=300, poll_interval=0.5):
+        # Shared lock store for coalescing across workers; None keeps it in-process
+        self.store = store
+        # The leader renews its lock every lock_ttl / 3 while it runs, so the
+        # lock only lapses lock_ttl after a leader dies without publishing
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    # Function to run function() once per key at a time; concurrent callers for the key get the same result
+
+    def run(self, key, function):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            logging.info(f"Waiting for the running conversion of {key}")
+            if not flight.done.wait(self.wait_timeout):
+                raise SingleFlightError(f"Timed out waiting for the conversion of {key}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._run_shared(key, function)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    # Function to run as the leader of the key across workers, or wait for the worker that is
+
+    def _run_shared(self, key, function):
+        if self.store is None:
+            return function()
+        owner = f"{self.owner}-{uuid.uuid4().hex}"
+        deadline = time.monotonic() + self.wait_timeout
+        waiting_for = None
+        while True:
+            state = self.store.fetch(key)
+            running = False
+            if state is not None:
+                flight_owner, finished, result, error = state
+                if finished and flight_owner == waiting_for:
+                    if error is not None:
+                        raise SingleFlightError(error)
+                    logging.info(f"Reused the conversion of {key} from another worker")
+                    return result
+                running = not finished
+                if running:
+                    waiting_for = flight_owner
+            # Outcomes of flights that finished before this caller arrived are not reused
+            if not running and self.store.acquire(key, owner, self.lock_ttl):
+                break
+            if time.monotonic() > deadline:
+                raise SingleFlightError(f"Timed out waiting for the conversion of {key}")
+            time.sleep(self.poll_interval)
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(key, owner, stop),
+                                     name=f"single-flight-{key}", daemon=True)
+        heartbeat.start()
+        try:
+            result = function()
+        except Exception as e:
+            self._stop_heartbeat(stop, heartbeat)
+            self.store.publish(key, owner, error=str(e) or type(e).__name__)
+            raise
+        self._stop_heartbeat(stop, heartbeat)
+        self.store.publish(key, owner, result=result)
+        return result
+
+    # Function to keep renewing the leader's lock until stop is set
+
+    def _heartbeat(self, key, owner, stop):
+        while not stop.wait(self.lock_ttl / 3):
+            if not self.store.renew(key, owner, self.lock_ttl):
+                logging.warning(f"Lost the conversion lock of {key} while converting it")
+                return
+
+    def _stop_heartbeat(self, stop, heartbeat):
+        stop.set()
+        heartbeat.join()
+
+    # Number of keys with a conversion running in this process
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,130 @@
+import json
+import logging
+
+from legs import Leg
+from market_table import RULES_BY_SPORTYBET_DESC
+
+try:
+    import orjson
+except ImportError:  # the stdlib decoder is used instead
+    orjson = None
+
+# Parser for Sportybet share payloads (/api/tz/orders/share/<code>). The
+# body is decoded straight from bytes with orjson when it is installed,
+# and for every event only the outcome flagged isSelected is taken as the
+# leg, rather than whichever outcome the loop happened to see last. Also
+# used by bulk reconciliation jobs, so the hot loop avoids repeated
+# lookups.
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# Line used when a lined market has no specifier
+DEFAULT_TOTAL = '2.5'
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Function to join an iterable of byte chunks (e.g. response.iter_content()) into one buffer
+
+
+def _read_chunks(chunks):
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+    return buffer
+
+
+def _selected_outcome(outcomes):
+    for outcome in outcomes:
+        if outcome.get('isSelected'):
+            return outcome
+    # Older payloads only carry the picked outcome, without the flag
+    if len(outcomes) == 1:
+        return outcomes[0]
+    return None
+
+# Function to yield one Leg per event from an already decoded payload. A pick
+# on a market the translation table doesn't cover is still yielded, with the
+# Sportybet desc as its market type, and so is a pick whose outcome can't be
+# told apart, with an empty selection, so the conversion can report them
+# instead of booking the slip without them
+
+
+def iter_matches(payload):
+    data = payload.get('data') or {}
+    for event in data.get('outcomes') or ():
+        leg = None
+        unsupported = None
+        unselected = None
+        for market in event.get('markets') or ():
+            rule = RULES_BY_SPORTYBET_DESC.get(market.get('desc'))
+            outcomes = market.get('outcomes') or ()
+            if rule is None:
+                if unsupported is None:
+                    selected = _selected_outcome(outcomes)
+                    if selected is not None:
+                        unsupported = (market, selected)
+                continue
+            selected = _selected_outcome(outcomes)
+            line = None
+            if rule.lined:
+                line = rule.parse_line(market.get('specifier'), DEFAULT_TOTAL)
+            if selected is None:
+                logging.debug(
+                    f"No selected outcome in {market.get('desc')} for event {event.get('eventId')}")
+                if unselected is None:
+                    unselected = (market, rule, line)
+                continue
+            if not selected.get('desc'):
+                raise ValueError(
+                    f"Selected outcome in {market.get('desc')} has no name for event {event.get('eventId')}")
+            leg = Leg(event.get('eventId'),
+                      (event.get('homeTeamName') or '').strip(),
+                      (event.get('awayTeamName') or '').strip(),
+                      event.get('estimateStartTime'),
+                      rule.market_type,
+                      selected.get('desc'),  # e.g., "Home", "Over 0.5", "Yes"
+                      line=line,
+                      odds=[(outcome.get('desc'), float(outcome.get('odds') or 0))
+                            for outcome in outcomes])
+            break
+        if leg is None and unselected is not None:
+            market, rule, line = unselected
+            leg = Leg(event.get('eventId'),
+                      (event.get('homeTeamName') or '').strip(),
+                      (event.get('awayTeamName') or '').strip(),
+                      event.get('estimateStartTime'),
+                      rule.market_type,
+                      '',
+                      line=line,
+                      odds=[(outcome.get('desc'), float(outcome.get('odds') or 0))
+                            for outcome in market.get('outcomes') or ()])
+        elif leg is None and unsupported is not None:
+            market, selected = unsupported
+            leg = Leg(event.get('eventId'),
+                      (event.get('homeTeamName') or '').strip(),
+                      (event.get('awayTeamName') or '').strip(),
+                      event.get('estimateStartTime'),
+                      market.get('desc') or 'Unknown market',
+                      selected.get('desc') or '',
+                      odds=[(outcome.get('desc'), float(outcome.get('odds') or 0))
+                            for outcome in market.get('outcomes') or ()])
+        if leg is not None:
+            yield leg
+
+# Function to parse a share payload given as bytes, str, a decoded dict or an iterable of byte chunks
+
+
+def parse_share_payload(data):
+    if isinstance(data, dict):
+        payload = data
+    elif isinstance(data, (bytes, bytearray, str)):
+        payload = loads(data)
+    else:
+        payload = loads(_read_chunks(data))
+    if not isinstance(payload, dict):
+        raise ValueError("Sportybet share payload is not a JSON object")
+    return list(iter_matches(payload))
@@ -0,0 +1,133 @@
+import re
+import threading
+
+# Fuzzy resolver from Sportybet team names to known Betpawa team names.
+# Known names are indexed by character n-grams; a lookup scores only the
+# names sharing grams with the query and memoizes the result per name.
+# The n-gram score is then scaled by how many words line up on each side,
+# so "Arsenal Women" or "Manchester City U21" don't pass for the senior team.
+# A best match with a close runner-up ("Madrid": Real or Atletico) has its
+# confidence cut, since the score alone can't tell the two apart.
+
+# Tokens that differ between bookmakers without changing the team
+IGNORED_TOKENS = {"fc", "afc", "cf", "sc", "fk", "club"}
+
+# Runner-up / best score ratio from which the best match counts as ambiguous
+AMBIGUOUS_RATIO = 0.8
+
+
+def normalize_team(name):
+    tokens = re.sub(r"[^\w\s]", " ", name.lower()).split()
+    kept = [token for token in tokens if token not in IGNORED_TOKENS]
+    return " ".join(kept or tokens)
+
+
+def ngrams(text, n):
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def dice(a, b):
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+# Function to return the share of tokens that have a close counterpart (spelling variants included) among others
+
+
+def matched_share(tokens, others, n):
+    matched = 0
+    for token in tokens:
+        grams = ngrams(token, n)
+        if token in others or any(dice(grams, ngrams(other, n)) >= 0.6 for other in others):
+            matched += 1
+    return matched / len(tokens)
+
+
+# Function to scale an n-gram score by how many words line up on each side
+
+
+def token_factor(query_tokens, name_tokens, n):
+    # Extra query words ("U21", "Women", "B") usually name another squad and
+    # cost most; extra known-name words are often just the long form
+    # ("Borussia") and cost half as much
+    return (matched_share(query_tokens, name_tokens, n) ** 2
+            * (1 + matched_share(name_tokens, query_tokens, n)) / 2)
+
+
+def gram_score(count, query_size, name_size):
+    # Blend Dice similarity with how much of the query is covered, so short
+    # forms like "Dortmund" still score well
+    similarity = 2.0 * count / (query_size + name_size)
+    return (similarity + count / query_size) / 2
+
+
+class TeamResolver:
+    def __init__(self, names=(), n=3):
+        self.n = n
+        self._lock = threading.Lock()
+        self.rebuild(names)
+
+    # Function to (re)build the n-gram index over the known Betpawa names
+
+    def rebuild(self, names):
+        names = sorted(set(names))
+        grams = [ngrams(normalize_team(name), self.n) for name in names]
+        index = {}
+        for position, name_grams in enumerate(grams):
+            for gram in name_grams:
+                index.setdefault(gram, []).append(position)
+        with self._lock:
+            self._names = names
+            self._grams = grams
+            self._index = index
+            self._memo = {}
+
+    # Function to return the best known name and a 0-1 confidence score
+
+    def resolve(self, name):
+        memo = self._memo
+        result = memo.get(name)
+        if result is not None:
+            return result
+
+        with self._lock:
+            names, grams, index = self._names, self._grams, self._index
+        query = ngrams(normalize_team(name), self.n)
+        shared = {}
+        for gram in query:
+            for position in index.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        query_tokens = normalize_team(name).split()
+        best_name, best_score, second_score = None, 0.0, 0.0
+        for position, count in shared.items():
+            score = gram_score(count, len(query), len(grams[position]))
+            if score <= second_score:
+                continue
+            name_tokens = normalize_team(names[position]).split()
+            score *= token_factor(query_tokens, name_tokens, self.n)
+            if score > best_score:
+                best_name, best_score, second_score = names[position], score, best_score
+            elif score > second_score:
+                second_score = score
+        if best_score and second_score / best_score > AMBIGUOUS_RATIO:
+            # Scale down to 0 as the runner-up closes in on the best match
+            best_score *= (1 - second_score / best_score) / (1 - AMBIGUOUS_RATIO)
+        result = (best_name, best_score)
+        memo[name] = result
+        return result
+
+    # Function to score name against one given known name, on the same 0-1 scale as resolve()
+
+    def score(self, name, known_name):
+        query_text, known_text = normalize_team(name), normalize_team(known_name)
+        query, known = ngrams(query_text, self.n), ngrams(known_text, self.n)
+        count = len(query & known)
+        if not count:
+            return 0.0
+        return (gram_score(count, len(query), len(known))
+                * token_factor(query_text.split(), known_text.split(), self.n))
+
+    def __len__(self):
+        return len(self._names)